@@ -0,0 +1,57 @@
+"""
+JSON helpers that use the fastest parser available: orjson, then ujson, then the
+standard json module.
+
+orjson is stricter than json: it rejects NaN/Infinity and lone surrogates, so
+documents it refuses are re-parsed with json. ujson accepts what json does, but
+may round the last digit of some floats differently.
+"""
+import json
+
+try:
+    import orjson  # Optional, several times faster than json
+    
+    def loads(data):
+        """Parse JSON from str or bytes, falling back to json for documents orjson rejects."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+    
+    def dumps(obj, pretty: bool = False) -> str:
+        """Serialize obj as compact JSON (indented by 2 if pretty), keeping non-ASCII characters."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+except ImportError:
+    try:
+        import ujson  # Optional, faster than json
+        
+        loads = ujson.loads
+        
+        def dumps(obj, pretty: bool = False) -> str:
+            """Serialize obj as compact JSON (indented by 2 if pretty), keeping non-ASCII characters."""
+            return ujson.dumps(obj, ensure_ascii=False, indent=2 if pretty else 0)
+    except ImportError:
+        loads = json.loads
+        
+        def dumps(obj, pretty: bool = False) -> str:
+            """Serialize obj as compact JSON (indented by 2 if pretty), keeping non-ASCII characters."""
+            return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None)
+
+
+def load(f):
+    """Parse JSON from an open file; binary mode ('rb') skips a text-decoding pass."""
+    return loads(f.read())
+
+
+def iter_array(f):
+    """
+    Yield the items of a top-level JSON array from a file opened in binary mode.
+    Streams with ijson when installed, so the whole array is never held in memory;
+    otherwise parses the file in one go.
+    """
+    try:
+        import ijson  # Optional streaming parser
+    except ImportError:
+        yield from load(f)
+        return
+    yield from ijson.items(f, 'item', use_float=True)
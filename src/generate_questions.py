@@ -5,7 +5,7 @@ Generate trivia questions from page content using template-based approach.
 
 import re
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Question templates
 QUESTION_TEMPLATES = {
@@ -37,6 +37,17 @@ QUESTION_TEMPLATES = {
     ],
 }
 
+# Template index per (fact_type, question_type); unmapped keys pick randomly
+_TEMPLATE_INDEX = {
+    (fact_type, question_type): 0
+    for fact_type in ('relationship', 'class', 'date', 'born')
+    for question_type in QUESTION_TEMPLATES
+}
+_TEMPLATE_INDEX.update({
+    ('relationship', 'who'): 2,  # "Who was X's Y?"
+    **{('name', question_type): 1 for question_type in QUESTION_TEMPLATES},  # "What is the name of X?"
+})
+
 def clean_mediawiki_markup(text: str) -> str:
     """Remove MediaWiki markup from text."""
     # Remove [[links|display]] or [[links]]
@@ -49,6 +60,13 @@ def clean_mediawiki_markup(text: str) -> str:
     text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
+def _is_word_prefix(text: str, word: str) -> bool:
+    """
+    True if text is word or starts with word followed by a space. Same as
+    text == word or text.startswith(word + ' '), without building the concatenation.
+    """
+    return text.startswith(word) and text[len(word):len(word) + 1] in ('', ' ')
+
 def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
     """
     Extract specific, factual information: names, dates, locations, relationships, classes.
@@ -63,12 +81,13 @@ def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
     """
     facts = []
     page_title = page.get('title', '').strip()
+    page_title_lower = page_title.lower()
     
     # Pattern 1: "X was born in Y" or "X was born on Y" (location/date)
     born_pattern = re.compile(r'([A-Z][^.!?]*?)\s+was\s+born\s+(?:in|on)\s+([^.!?]+)', re.I)
     for match in born_pattern.finditer(text):
         subject = match.group(1).strip()
-        if subject.lower() == page_title.lower() or page_title.lower().startswith(subject.lower() + ' '):
+        if _is_word_prefix(page_title_lower, subject.lower()):
             location_date = clean_mediawiki_markup(match.group(2).strip())
             # Extract just the key part (first 50 chars, stop at comma if present)
             answer = location_date.split(',')[0].strip()[:50]
@@ -89,7 +108,7 @@ def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
         person = match.group(3).strip()
         person = clean_mediawiki_markup(person).split(',')[0].split('(')[0].strip()[:50]
         
-        if subject.lower() == page_title.lower() or page_title.lower().startswith(subject.lower() + ' '):
+        if _is_word_prefix(page_title_lower, subject.lower()):
             if len(person) > 3 and len(person) < 50:
                 facts.append({
                     'type': 'relationship',
@@ -107,7 +126,7 @@ def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
         ship_class = match.group(2).strip()
         ship_class = clean_mediawiki_markup(ship_class).split(',')[0].split('(')[0].strip()[:50]
         
-        if subject.lower() == page_title.lower() or page_title.lower().startswith(subject.lower() + ' '):
+        if _is_word_prefix(page_title_lower, subject.lower()):
             if len(ship_class) > 2 and len(ship_class) < 50:
                 facts.append({
                     'type': 'class',
@@ -124,7 +143,7 @@ def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
         name = match.group(2).strip()
         name = clean_mediawiki_markup(name).split(',')[0].split('(')[0].split('.')[0].strip()[:50]
         
-        if subject.lower() == page_title.lower() or page_title.lower().startswith(subject.lower() + ' '):
+        if _is_word_prefix(page_title_lower, subject.lower()):
             if len(name) > 2 and len(name) < 50:
                 facts.append({
                     'type': 'name',
@@ -141,7 +160,7 @@ def extract_specific_facts(text: str, page: Dict) -> List[Dict]:
         date = match.group(2).strip()
         date = clean_mediawiki_markup(date).split(',')[0].split('(')[0].strip()[:50]
         
-        if subject.lower() == page_title.lower() or page_title.lower().startswith(subject.lower() + ' '):
+        if _is_word_prefix(page_title_lower, subject.lower()):
             if any(char.isdigit() for char in date) and len(date) > 5 and len(date) < 50:
                 facts.append({
                     'type': 'date',
@@ -187,7 +206,7 @@ def extract_facts_from_content(text: str, page: Dict, focus_tags: Optional[Dict]
             char_list = [c.lower().strip() for c in focus_tags['characters']]
             focus_terms.update(char_list)
             # Check if page title matches character (strict mode)
-            if any(char_title == page_title or page_title.startswith(char_title + ' ') for char_title in char_list):
+            if any(_is_word_prefix(page_title, char_title) for char_title in char_list):
                 strict_character_match = True
         if focus_tags.get('species'):
             focus_terms.update([s.lower() for s in focus_tags['species']])
@@ -216,7 +235,7 @@ def extract_facts_from_content(text: str, page: Dict, focus_tags: Optional[Dict]
         if strict_character_match:
             # STRICT MODE: Only facts where subject matches page title (character name)
             # This ensures facts are about the character, not just mentioning them
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         elif focus_terms:
             # FOCUS MODE: Facts mentioning focus terms
@@ -224,7 +243,7 @@ def extract_facts_from_content(text: str, page: Dict, focus_tags: Optional[Dict]
                 is_relevant = True
         else:
             # NO FOCUS: Include all facts about page title
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         
         # Make predicate more concise - extract key phrase (first 60 chars, stop at comma)
@@ -254,13 +273,13 @@ def extract_facts_from_content(text: str, page: Dict, focus_tags: Optional[Dict]
         
         if strict_character_match:
             # STRICT: Only facts about the character
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         elif focus_terms:
             if any(term in subject_lower for term in focus_terms) or subject_lower == page_title:
                 is_relevant = True
         else:
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         
         # Make role more concise
@@ -290,13 +309,13 @@ def extract_facts_from_content(text: str, page: Dict, focus_tags: Optional[Dict]
         
         if strict_character_match:
             # STRICT: Only facts about the character
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         elif focus_terms:
             if any(term in subject_lower for term in focus_terms) or subject_lower == page_title:
                 is_relevant = True
         else:
-            if subject_lower == page_title or subject_lower.startswith(page_title + ' '):
+            if _is_word_prefix(subject_lower, page_title):
                 is_relevant = True
         
         # Make trait more concise
@@ -444,10 +463,35 @@ def select_appropriate_question_types(page: Dict, fact: Dict, requested_types: L
     
     return appropriate_types
 
+def _page_question_context(page: Dict) -> Tuple[Dict, str, List[str], str]:
+    """
+    Build the page-level fields shared by every question generated from a page.
+    Questions get their own copies of the tags, so the result can be reused safely.
+    
+    Args:
+        page: Page object with metadata
+    
+    Returns:
+        Tuple of (tags, content_snippet, series, primary_series)
+    """
+    series = page.get('series', ['Star Trek'])
+    primary_series = series[0] if series else 'Star Trek'
+    tags = {
+        'character': page.get('characters', [])[:3],  # Top 3 characters
+        'species': page.get('species', [])[:2],
+        'location': page.get('locations', [])[:2],
+        'organization': page.get('organizations', [])[:2],
+        'concept': page.get('concepts', [])[:2],
+        'episode': page.get('episodes', [])[:2],
+    }
+    content_snippet = page.get('content_snippet', '')[:200]
+    return tags, content_snippet, series, primary_series
+
 def generate_question_from_fact(
     fact: Dict,
     page: Dict,
-    question_type: str = 'what'
+    question_type: str = 'what',
+    context: Optional[Tuple[Dict, str, List[str], str]] = None
 ) -> Optional[Dict]:
     """
     Generate a question from a fact using templates.
@@ -456,6 +500,7 @@ def generate_question_from_fact(
         fact: Fact dictionary with subject, predicate, etc.
         page: Page object with metadata
         question_type: Type of question ('what', 'who', 'where', 'which')
+        context: Precomputed result of _page_question_context(page), if available
     
     Returns:
         Question dictionary or None if generation fails
@@ -463,9 +508,9 @@ def generate_question_from_fact(
     if question_type not in QUESTION_TEMPLATES:
         return None
     
-    # Get primary series
-    series = page.get('series', ['Star Trek'])
-    primary_series = series[0] if series else 'Star Trek'
+    if context is None:
+        context = _page_question_context(page)
+    tags, content_snippet, series, primary_series = context
     
     # Get subject (use page title - ensures question is about the page)
     subject = page.get('title', fact.get('subject', 'Unknown'))
@@ -475,28 +520,9 @@ def generate_question_from_fact(
     fact_type = fact.get('type', '')
     relationship = fact.get('relationship', '')
     
-    # Map fact types to specific templates
-    template_index = 0
-    if fact_type == 'relationship' and relationship:
-        # Use relationship-specific template if available
-        if question_type == 'who' and len(templates) > 2:
-            # Try to find relationship template
-            template_index = 2  # "Who was X's Y?"
-        else:
-            template_index = 0
-    elif fact_type == 'class':
-        template_index = 0  # "What is the class of X?"
-    elif fact_type == 'name':
-        template_index = 1  # "What is the name of X?"
-    elif fact_type == 'date' or fact_type == 'born':
-        if question_type == 'when':
-            template_index = 0  # "When is X?"
-        elif question_type == 'where':
-            template_index = 0  # "Where was X born?"
-        else:
-            template_index = 0
-    else:
-        # Random selection for variety
+    # Map fact types to specific templates (random selection for variety otherwise)
+    template_index = _TEMPLATE_INDEX.get((fact_type, question_type))
+    if template_index is None or (fact_type == 'relationship' and not relationship):
         template_index = random.randint(0, len(templates) - 1)
     
     template = templates[template_index]
@@ -534,16 +560,9 @@ def generate_question_from_fact(
         'answer': answer,
         'source_page': page.get('title'),
         'series': series,
-        'tags': {
-            'character': page.get('characters', [])[:3],  # Top 3 characters
-            'species': page.get('species', [])[:2],
-            'location': page.get('locations', [])[:2],
-            'organization': page.get('organizations', [])[:2],
-            'concept': page.get('concepts', [])[:2],
-            'episode': page.get('episodes', [])[:2],
-        },
+        'tags': {tag_type: list(values) for tag_type, values in tags.items()},  # Each question owns its tags
         'question_type': question_type,
-        'content_snippet': page.get('content_snippet', '')[:200],
+        'content_snippet': content_snippet,
         'fact_text': fact.get('text', '')
     }
 
@@ -576,6 +595,9 @@ def generate_questions_from_page(
     if not facts:
         return questions
     
+    # Page-level tags/snippet are identical for every question from this page
+    context = _page_question_context(page)
+    
     # Generate questions from facts - select appropriate question types per fact
     for fact in facts:
         if len(questions) >= max_questions:
@@ -587,7 +609,7 @@ def generate_questions_from_page(
         for q_type in appropriate_types:
             if len(questions) >= max_questions:
                 break
-            question = generate_question_from_fact(fact, page, q_type)
+            question = generate_question_from_fact(fact, page, q_type, context=context)
             if question:
                 # Avoid duplicate questions (same question text)
                 if not any(q['question'] == question['question'] for q in questions):
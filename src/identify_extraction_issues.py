@@ -1,174 +1,202 @@
 #!/usr/bin/env python3
 """Identify remaining extraction issues before re-extraction."""
-import json
+import os
 import re
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple
+
+from _fastjson import loads as json_loads
+
+BRACKETS_PATTERN = re.compile(r'\[\[[^\]]+\]\]')
+TEMPLATE_PATTERN = re.compile(r'\{\{[^}]+\}\}')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Every artifact starts with one of these sigils (none are escaped by JSON encoders),
+# so a file whose raw bytes contain none of them cannot have any issues
+ARTIFACT_SIGILS = (b"''", b'[[', b'{{', b'<')
+
+def _formatting_issues(text: str) -> Iterator[str]:
+    """
+    Yield each MediaWiki formatting artifact found in text, in pattern order.
+    
+    Cheap substring checks on each artifact's sigil run first, so clean text
+    never reaches the regex engine. Triple quotes are checked before double
+    quotes so the longer artifact comes first.
+    """
+    if "'''" in text:
+        yield 'triple_quotes'
+    if "''" in text:
+        yield 'double_quotes'
+    if '[[' in text and BRACKETS_PATTERN.search(text):
+        yield 'brackets'
+    if '{{' in text and TEMPLATE_PATTERN.search(text):
+        yield 'templates'
+    if '<' in text and HTML_TAG_PATTERN.search(text):
+        yield 'html_tags'
+
+ISSUE_CATEGORIES = (
+    'quote_text',
+    'quote_source',
+    'description',
+    'timeline_events',
+    'character_name',
+    'other_fields',
+)
+
+# Categories that report every artifact found in a field; the others report only the first
+EVERY_ISSUE_CATEGORIES = frozenset({'character_name'})
+
+class Hit(NamedTuple):
+    """A single formatting artifact found in a character field."""
+    character: str
+    field: str
+    issue: str
+    text: str
+
+def _scan_file(json_file) -> Dict[str, List[Hit]]:
+    """Scan one extracted character file and return its issues by category."""
+    issues = {category: [] for category in ISSUE_CATEGORIES}
+    
+    try:
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        # One pass over the whole file skips decoding and field checks for clean characters
+        if not any(sigil in raw for sigil in ARTIFACT_SIGILS):
+            return issues
+        data = json_loads(raw)
+        # Appearances are never scanned; release that (often largest) subtree right away
+        data.pop('appearances', None)
+        
+        char = data.get('character', {})
+        char_name = char.get('name', 'Unknown')
+        
+        # Collect every text field as (category, field label, text) so one loop checks them all
+        fields = []
+        quote = char.get('quote')
+        if quote and isinstance(quote, dict):
+            fields.append(('quote_text', 'quote.text', quote.get('text')))
+            fields.append(('quote_source', 'quote.source', quote.get('source')))
+        fields.append(('description', 'description', char.get('description')))
+        fields.extend(
+            ('timeline_events', f"{section_name}.{field}", event.get(field))
+            for section_name, events in data.items()
+            if section_name != 'character' and isinstance(events, list)
+            for event in events
+            if isinstance(event, dict)
+            for field in ('event', 'background', 'relationship')
+        )
+        fields.append(('character_name', 'name', char.get('name')))
+        fields.extend(
+            ('other_fields', field, char.get(field))
+            for field in ('species', 'rank', 'occupation', 'father', 'mother')
+        )
+        
+        for category, label, text in fields:
+            if text and isinstance(text, str):
+                limit = None if category in EVERY_ISSUE_CATEGORIES else 1
+                for issue in islice(_formatting_issues(text), limit):
+                    issues[category].append(Hit(char_name, label, issue, text[:150]))
+    
+    except Exception as e:
+        pass
+    
+    return issues
+
+def _scan_all(json_files: List[str]) -> Iterator[Dict[str, List[Hit]]]:
+    """Yield each file's issues as it is scanned, so only one file's hits are held at a time."""
+    # Each file is scanned independently, so spread the work across processes
+    with ProcessPoolExecutor() as executor:
+        yield from executor.map(_scan_file, json_files, chunksize=32)
 
 def find_formatting_issues():
     """Find MediaWiki formatting artifacts in extracted data."""
     extract_dir = Path("data/characters/bulk_extract_full_20251114")
-    json_files = [f for f in extract_dir.glob("*.json") if f.name != "bulk_extraction_checkpoint.json"]
+    with os.scandir(extract_dir) as entries:
+        json_files = [
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.endswith('.json') and entry.name != "bulk_extraction_checkpoint.json"
+        ]
     
+    # Only counts and a few samples are reported, so keep aggregates rather than every hit
     issues = {
-        'quote_text': [],
-        'quote_source': [],
-        'description': [],
-        'timeline_events': [],
-        'character_name': [],
-        'other_fields': []
-    }
-    
-    formatting_patterns = {
-        'triple_quotes': re.compile(r"'''"),
-        'double_quotes': re.compile(r"''"),
-        'brackets': re.compile(r'\[\[([^\]]+)\]\]'),
-        'templates': re.compile(r'\{\{[^}]+\}\}'),
-        'html_tags': re.compile(r'<[^>]+>'),
+        category: {'count': 0, 'chars': set(), 'by_type': Counter(), 'samples': []}
+        for category in ISSUE_CATEGORIES
     }
     
     print(f"Scanning {len(json_files)} character files for formatting issues...\n")
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            char = data.get('character', {})
-            char_name = char.get('name', 'Unknown')
-            
-            # Check quote
-            quote = char.get('quote')
-            if quote and isinstance(quote, dict):
-                quote_text = quote.get('text', '')
-                quote_source = quote.get('source', '')
-                
-                for pattern_name, pattern in formatting_patterns.items():
-                    if pattern.search(quote_text):
-                        issues['quote_text'].append({
-                            'character': char_name,
-                            'issue': pattern_name,
-                            'text': quote_text[:150]
-                        })
-                    if pattern.search(quote_source):
-                        issues['quote_source'].append({
-                            'character': char_name,
-                            'issue': pattern_name,
-                            'text': quote_source[:150]
-                        })
-            
-            # Check description
-            description = char.get('description', '')
-            if description:
-                for pattern_name, pattern in formatting_patterns.items():
-                    if pattern.search(description):
-                        issues['description'].append({
-                            'character': char_name,
-                            'issue': pattern_name,
-                            'text': description[:150]
-                        })
-                        break  # Only report once per description
-            
-            # Check timeline events
-            timeline_sections = {k: v for k, v in data.items() if k not in ['character', 'appearances']}
-            for section_name, events in timeline_sections.items():
-                if isinstance(events, list):
-                    for event in events:
-                        for field in ['event', 'background', 'relationship']:
-                            text = event.get(field, '')
-                            if text:
-                                for pattern_name, pattern in formatting_patterns.items():
-                                    if pattern.search(text):
-                                        issues['timeline_events'].append({
-                                            'character': char_name,
-                                            'section': section_name,
-                                            'issue': pattern_name,
-                                            'text': text[:150]
-                                        })
-                                        break
-            
-            # Check character name for issues
-            name = char.get('name', '')
-            if name:
-                for pattern_name, pattern in formatting_patterns.items():
-                    if pattern.search(name):
-                        issues['character_name'].append({
-                            'character': char_name,
-                            'issue': pattern_name
-                        })
-            
-            # Check other character fields
-            for field in ['species', 'rank', 'occupation', 'father', 'mother']:
-                value = char.get(field)
-                if value and isinstance(value, str):
-                    for pattern_name, pattern in formatting_patterns.items():
-                        if pattern.search(value):
-                            issues['other_fields'].append({
-                                'character': char_name,
-                                'field': field,
-                                'issue': pattern_name,
-                                'text': value[:100]
-                            })
-                            break
-        
-        except Exception as e:
-            continue
+    for file_issues in _scan_all(json_files):
+        for category, issue_list in file_issues.items():
+            if not issue_list:
+                continue
+            record = issues[category]
+            record['count'] += len(issue_list)
+            record['chars'].add(issue_list[0].character)  # Each file holds a single character
+            for hit in issue_list:
+                record['by_type'][hit.issue] += 1
+                if len(record['samples']) < 3:
+                    record['samples'].append(hit)
     
     # Print summary
     print("=" * 60)
     print("EXTRACTION ISSUES SUMMARY")
     print("=" * 60)
     
-    total_issues = sum(len(v) for v in issues.values())
+    total_issues = sum(record['count'] for record in issues.values())
     print(f"\nTotal formatting issues found: {total_issues}")
     
     print(f"\nBy Category:")
-    for category, issue_list in issues.items():
-        if issue_list:
-            print(f"  {category}: {len(issue_list)} issues")
+    for category, record in issues.items():
+        if record['count']:
+            print(f"  {category}: {record['count']} issues")
             
             # Show unique characters affected
-            unique_chars = len(set(i['character'] for i in issue_list))
-            print(f"    ({unique_chars} unique characters affected)")
+            print(f"    ({len(record['chars'])} unique characters affected)")
+            
+            # Show breakdown by artifact type
+            by_type = ", ".join(f"{name}: {count}" for name, count in record['by_type'].most_common())
+            print(f"    By type: {by_type}")
             
             # Show sample issues
-            if len(issue_list) <= 5:
+            if record['count'] <= 5:
                 print(f"    Samples:")
-                for issue in issue_list[:3]:
-                    print(f"      - {issue['character']}: {issue['issue']}")
+                for hit in record['samples']:
+                    print(f"      - {hit.character}: {hit.issue}")
             else:
                 print(f"    Top 3 samples:")
-                for issue in issue_list[:3]:
-                    print(f"      - {issue['character']}: {issue['issue']}")
-                    if 'text' in issue:
-                        print(f"        Text: {issue['text'][:80]}...")
+                for hit in record['samples']:
+                    print(f"      - {hit.character}: {hit.issue}")
+                    print(f"        Text: {hit.text[:80]}...")
     
     # Recommendations
     print(f"\n" + "=" * 60)
     print("RECOMMENDATIONS")
     print("=" * 60)
     
-    if issues['quote_text'] or issues['quote_source']:
+    if issues['quote_text']['count'] or issues['quote_source']['count']:
         print("OK: Quote formatting fix already applied - will be cleaned in re-extraction")
     
-    if issues['description']:
-        desc_count = len(issues['description'])
+    desc_count = issues['description']['count']
+    if desc_count:
         print(f"WARNING: {desc_count} descriptions have formatting issues")
         print("   Recommendation: Description cleaning is already in clean_mediawiki_markup()")
         print("   May need to verify it's being applied correctly")
     
-    if issues['timeline_events']:
-        timeline_count = len(issues['timeline_events'])
+    timeline_count = issues['timeline_events']['count']
+    if timeline_count:
         print(f"WARNING: {timeline_count} timeline events have formatting issues (MOST COMMON)")
         print("   Recommendation: Timeline events are cleaned, but may need additional passes")
         print("   Check if clean_mediawiki_markup() is removing all formatting correctly")
     
-    if issues['character_name']:
-        print(f"WARNING: {len(issues['character_name'])} character names have formatting issues")
+    if issues['character_name']['count']:
+        print(f"WARNING: {issues['character_name']['count']} character names have formatting issues")
         print("   Recommendation: Character names should be cleaned during extraction")
     
-    if issues['other_fields']:
-        other_count = len(issues['other_fields'])
+    other_count = issues['other_fields']['count']
+    if other_count:
         print(f"WARNING: {other_count} other character fields have formatting issues")
         print("   Recommendation: All character fields should use clean_mediawiki_markup()")
     
@@ -177,4 +205,3 @@ def find_formatting_issues():
 
 if __name__ == "__main__":
     find_formatting_issues()
-
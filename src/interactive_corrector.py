@@ -2,11 +2,15 @@
 """
 Interactive tool for correcting unnatural questions and learning patterns.
 """
-import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict
+from _fastjson import loads as json_loads
 from learn_from_corrections import apply_correction, save_correction, load_corrections
 
+
 def correct_question_interactive(question_data: Dict):
     """Interactively correct a single question."""
     print("\n" + "="*60)
@@ -48,8 +52,8 @@ def correct_question_interactive(question_data: Dict):
 
 def correct_from_report(report_file: str = "data/unnatural_questions_report.json"):
     """Correct questions from the unnatural questions report."""
-    with open(report_file, 'r', encoding='utf-8') as f:
-        unnatural_questions = json.load(f)
+    with open(report_file, 'rb') as f:
+        unnatural_questions = json_loads(f.read())
     
     print(f"\nFound {len(unnatural_questions)} unnatural questions to correct.")
     print("We'll go through them one by one.\n")
@@ -70,19 +74,29 @@ def correct_from_report(report_file: str = "data/unnatural_questions_report.json
     return corrections
 
 
+@lru_cache(maxsize=4)
+def _load_questions_index(questions_file: str, mtime: float) -> Dict[str, Dict]:
+    """Load a questions file indexed by question text (mtime keys the cache)."""
+    with open(questions_file, 'rb') as f:
+        questions = json_loads(f.read())
+    
+    index = {}
+    for q in questions:
+        index.setdefault(q.get('question'), q)  # First occurrence wins
+    return index
+
+
 def correct_specific_question(question_text: str, questions_file: str = "data/questions_mvp_improved.json"):
     """Correct a specific question by text."""
-    with open(questions_file, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+    questions = _load_questions_index(questions_file, os.path.getmtime(questions_file))
     
     # Find the question
-    matching = [q for q in questions if q.get('question') == question_text]
+    question_data = questions.get(question_text)
     
-    if not matching:
+    if not question_data:
         print(f"Question not found: {question_text}")
         return None
     
-    question_data = matching[0]
     return correct_question_interactive(question_data)
 
 
@@ -4,14 +4,23 @@ Learn from user corrections to improve question generation.
 This script allows interactive correction of questions and builds a pattern library.
 """
 import json
+import os
 import re
-from typing import Dict, List, Optional
+import sqlite3
+import string
+from contextlib import closing
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from types import MappingProxyType
+
+from _fastjson import dumps as json_dumps, loads as json_loads
 
 # Pattern library - stores learned patterns for better question generation
 PATTERN_LIBRARY = {
     'fondness': {
-        'pattern': r'fondness for (\w+)',
+        'pattern': re.compile(r'fondness for (\w+)', re.I),
         'templates': [
             "Which episode of {series} showed {character}'s particular fondness for {item}?",
             "In which episode of {series} did {character} express a fondness for {item}?",
@@ -19,7 +28,7 @@ PATTERN_LIBRARY = {
         ]
     },
     'preference': {
-        'pattern': r'preference for (\w+)',
+        'pattern': re.compile(r'preference for (\w+)', re.I),
         'templates': [
             "Which episode of {series} revealed {character}'s preference for {item}?",
             "In \"{episode}\" of {series}, what preference did {character} express?"
@@ -28,67 +37,192 @@ PATTERN_LIBRARY = {
     # Add more patterns as we learn them
 }
 
+# Templates pre-split into (literal text, field name) chunks so rendering skips the format parser
+PARSED_TEMPLATES = {
+    pattern_key: tuple(
+        tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+        for template in pattern['templates']
+    )
+    for pattern_key, pattern in PATTERN_LIBRARY.items()
+}
+
+# Full names for series abbreviations, generalized to {series_name} in templates (read-only)
+SERIES_NAME_MAP = MappingProxyType({
+    'ENT': 'Enterprise',
+    'TNG': 'The Next Generation',
+    'TOS': 'The Original Series',
+    'DS9': 'Deep Space Nine',
+    'VOY': 'Voyager',
+    'DIS': 'Discovery',
+    'SNW': 'Strange New Worlds',
+    'LD': 'Lower Decks',
+    'PRO': 'Prodigy',
+})
+
+# All patterns below are compiled once at import instead of on every call
+
+# Contextual item patterns for event/answer text ("fondness for X", etc.), keyed by
+# their literal lowercase lead-in so text without it never reaches the regex engine
+ITEM_PATTERNS = tuple(
+    (keyword, re.compile(keyword + r' ([^,\.]+)', re.I))
+    for keyword in ('fondness for', 'preference for', 'interest in', 'liking for')
+)
+
+# Common trailing words to strip from an extracted item (the regex covers unusual whitespace)
+TRAILING_WORDS = (' though', ' although', ' but', ' and', ' or')
+TRAILING_WORDS_PATTERN = re.compile(r'\s+(though|although|but|and|or).*$', re.I)
+
+# Contextual item patterns for corrected questions, checked in order (all lowercase)
+EXTRACT_PATTERN_SOURCES = (
+    # Quote/what questions come first: their statement can itself contain "who", "named", ...
+    (r'said that ([^?]+) was what\?', 'quote_what_question'),  # "said that X was what?"
+    (r'said that ([^?]+)\?', 'quote_what_question'),  # "said that X?"
+    (r'fondness for ([^?]+)', 'fondness_for'),
+    (r'preference for ([^?]+)', 'preference_for'),
+    (r'interest in ([^?]+)', 'interest_in'),
+    (r'liking for ([^?]+)', 'liking_for'),
+    (r'this character was nicknamed "([^"]+)"', 'nickname_reverse_question'),  # "this character was nicknamed \"Often Wrong\""
+    (r'this character was nicknamed ([^,]+),', 'nickname_reverse_question'),  # "this character was nicknamed X,"
+    (r'pony, ([^?]+)', 'pony_name'),  # "pony, Sir-Neighs-a-Lot"
+    (r'pony named ([^?]+)', 'pony_name'),  # "pony named X"
+    (r'named ([^?]+)', 'named_item'),  # Generic "named X" (must come after nickname patterns)
+    (r'born (sometime during the \d{4}s)', 'temporal_detail'),  # "born sometime during the 2360s"
+    (r'born (in \d{4})', 'temporal_detail'),  # "born in 2367"
+    (r'(\d{4}s)', 'temporal_detail'),  # Generic "2360s" as contextual detail
+    (r'what task is ([^?]+) attempting to accomplish\?', 'task_question'),  # "what task is X attempting to accomplish?"
+    (r'what is ([^?]+) attempting to (find|accomplish|do|solve)', 'task_question'),  # "what is X attempting to find?"
+    (r'which crew member ([^?]+)\?', 'who_question'),  # "which crew member was infected..."
+    (r'which character ([^?]+)\?', 'who_question'),  # "which character..."
+    (r'which officer ([^?]+)\?', 'who_question'),  # "which officer..."
+    (r'who ([^?]+)\?', 'who_question'),  # "who was..."
+    (r'who was ([^?]+) successor', 'successor_question'),  # "who was his successor"
+    (r'was the successor of which ([^?]+)\?', 'successor_question'),  # "was the successor of which officer?"
+    (r'had a valued family heirloom in the form of this type of ([^,]+), called', 'detail_what_question'),  # "had a valued family heirloom in the form of this type of coin, called"
+    (r'in the form of this type of ([^,]+), called', 'detail_what_question'),  # "in the form of this type of X, called"
+    (r'called his "([^"]+)"', 'named_detail'),  # "called his \"lucky loonie\""
+    (r'called his ([^?]+)\?', 'named_detail'),  # "called his lucky loonie?"
+    (r'it is revealed that ([^?]+) had', 'revealed_detail_question'),  # "it is revealed that X had"
+    (r'was instrumental in leading an elite team that exonerated this ([^?]+)\?', 'exoneration_question'),  # "was instrumental in leading an elite team that exonerated this falsely accused Captain"
+    (r'exonerated this ([^?]+)\?', 'exoneration_question'),  # "exonerated this falsely accused Captain"
+    (r'was referred to be this similar-sounding nickname', 'nickname_question'),  # "was referred to be this similar-sounding nickname"
+    (r'was referred to by this ([^?]+)\?', 'nickname_question'),  # "was referred to by this nickname?"
+    (r'was known by this ([^?]+)\?', 'nickname_question'),  # "was known by this nickname?"
+)
+# Case-sensitive versions run on lowercased ASCII questions; the re.I versions cover the rest
+EXTRACT_PATTERNS = tuple((re.compile(p), t) for p, t in EXTRACT_PATTERN_SOURCES)
+EXTRACT_PATTERNS_IGNORECASE = tuple((re.compile(p, re.I), t) for p, t in EXTRACT_PATTERN_SOURCES)
+
+# Literal text (lowercase) that every EXTRACT_PATTERNS match must contain; the digit
+# pairs cover the "2360s"-style temporal pattern
+EXTRACT_ANCHORS = (
+    'fondness for', 'preference for', 'interest in', 'liking for', 'named ', 'pony, ',
+    'born ', 'attempting to ', 'which ', 'who ', 'said that ', 'this type of ',
+    'called his ', 'revealed that ', 'exonerated this ', 'referred to b', 'known by this ',
+) + tuple(f'{digit}s' for digit in '0123456789')
+
+# Helpers for locating names and episodes inside a template
+EPISODE_WORD_PATTERN = re.compile(r'episode\s+(\w+)', re.I)
+SUCCESSOR_NAME_PATTERN = re.compile(r'(\w+\s+\w+)\s+was the successor', re.I)
+NAMED_DETAIL_PATTERN = re.compile(r'called his "?([^"?]+)"?\?', re.I)
+EXONERATION_CHARACTER_PATTERN = re.compile(r'(\w+\s+\w+)\s+was instrumental in leading', re.I)
+
 def extract_item_from_answer(answer: str, pattern_key: str) -> Optional[str]:
     """Extract the item (like 'Bularian canapés') from an answer."""
     if pattern_key in PATTERN_LIBRARY:
         pattern = PATTERN_LIBRARY[pattern_key]['pattern']
-        match = re.search(pattern, answer, re.I)
+        match = pattern.search(answer)
         if match:
             return match.group(1)
     return None
 
 
+def _render(parsed_template: Tuple[Tuple[str, Optional[str]], ...], values: Dict[str, str]) -> str:
+    """Fill a template from PARSED_TEMPLATES with values."""
+    parts = []
+    for literal, field in parsed_template:
+        parts.append(literal)
+        if field is not None:
+            parts.append(values[field])
+    return ''.join(parts)
+
+
+def _truncate_trailing(item: str, item_lower: Optional[str] = None) -> str:
+    """
+    Cut item at the first trailing word (" though", " and", ...), if any.
+    item_lower, if the caller already has it, is the lowercased item.
+    """
+    # Plain substring search is exact for ASCII text whose only whitespace is spaces
+    if not (item.isascii() and item.isprintable()):
+        return TRAILING_WORDS_PATTERN.sub('', item)
+    if item_lower is None:
+        item_lower = item.lower()
+    cut = min((index for index in map(item_lower.find, TRAILING_WORDS) if index >= 0), default=-1)
+    return item[:cut].rstrip() if cut >= 0 else item
+
+
+def _extract_item(text: str) -> Optional[str]:
+    """Find a contextual item like "fondness for X" in text, with trailing words trimmed."""
+    text_lower = text.lower()
+    for keyword, pattern in ITEM_PATTERNS:
+        if keyword not in text_lower:
+            continue
+        match = pattern.search(text)
+        if match:
+            item = match.group(1).strip()
+            # Clean up common trailing words; for ASCII text the lowercase view lines up with
+            # the original, so the item's lowercase form is just a slice of it
+            item_lower = text_lower[match.start(1):match.end(1)].strip() if text.isascii() else None
+            return _truncate_trailing(item, item_lower)
+    return None
+
+
+# Character file sections holding timeline events, in lookup order
+TIMELINE_SECTIONS = ('personal_life', 'career', 'relationships', 'other')
+
+
+@lru_cache(maxsize=128)
+def _load_event_items(character_file: str, mtime: float) -> Dict[Tuple[str, str], str]:
+    """
+    Index a character file's timeline events as (episode, series) -> contextual item.
+    Cached per file and modification time, so repeated lookups skip the reparse and scan.
+    """
+    with open(character_file, 'rb') as f:
+        char_data = json_loads(f.read())
+    
+    index = {}
+    # Look through timeline sections in order as one stream; the first event with an item wins
+    timeline_events = chain.from_iterable(
+        events for events in map(char_data.get, TIMELINE_SECTIONS) if isinstance(events, list)
+    )
+    for event in timeline_events:
+        if not isinstance(event, dict):
+            continue
+        
+        key = (event.get('episode', ''), event.get('series', ''))
+        if key in index:
+            continue
+        
+        event_text = event.get('event', '') or event.get('background', '') or event.get('relationship', '')
+        if event_text:
+            item = _extract_item(event_text)
+            if item is not None:
+                index[key] = item
+    
+    return index
+
+
 def extract_contextual_item_from_event(character_file: str, episode: str, series: str) -> Optional[str]:
     """
     Extract the contextual item from the original event text in the character JSON.
     This is where the actual event description lives.
     """
     try:
-        with open(character_file, 'r', encoding='utf-8') as f:
-            char_data = json.load(f)
-        
-        # Look through timeline sections for the matching event
-        timeline_sections = {
-            'personal_life': char_data.get('personal_life', []),
-            'career': char_data.get('career', []),
-            'relationships': char_data.get('relationships', []),
-            'other': char_data.get('other', []),
-        }
-        
-        for section_name, events in timeline_sections.items():
-            if not isinstance(events, list):
-                continue
-            
-            for event in events:
-                if not isinstance(event, dict):
-                    continue
-                
-                event_episode = event.get('episode', '')
-                event_series = event.get('series', '')
-                event_text = event.get('event', '') or event.get('background', '') or event.get('relationship', '')
-                
-                # Match by episode and series
-                if event_episode == episode and event_series == series and event_text:
-                    # Look for patterns like "fondness for X"
-                    patterns = [
-                        r'fondness for ([^,\.]+)',
-                        r'preference for ([^,\.]+)',
-                        r'interest in ([^,\.]+)',
-                        r'liking for ([^,\.]+)',
-                    ]
-                    
-                    for pattern in patterns:
-                        match = re.search(pattern, event_text, re.I)
-                        if match:
-                            item = match.group(1).strip()
-                            # Clean up common trailing words
-                            item = re.sub(r'\s+(though|although|but|and|or).*$', '', item, flags=re.I)
-                            return item
-        
+        event_items = _load_event_items(character_file, os.path.getmtime(character_file))
     except Exception as e:
-        pass  # If we can't load the file, return None
+        return None  # If we can't load the file, return None
     
-    return None
+    # Match by episode and series
+    return event_items.get((episode, series))
 
 
 def extract_contextual_item(answer: str, question_data: Dict) -> Optional[str]:
@@ -97,20 +231,9 @@ def extract_contextual_item(answer: str, question_data: Dict) -> Optional[str]:
     This looks for patterns like "fondness for X", "preference for X", etc.
     """
     # First try the answer text (in case it contains the full event description)
-    patterns = [
-        r'fondness for ([^,\.]+)',
-        r'preference for ([^,\.]+)',
-        r'interest in ([^,\.]+)',
-        r'liking for ([^,\.]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, answer, re.I)
-        if match:
-            item = match.group(1).strip()
-            # Clean up common trailing words
-            item = re.sub(r'\s+(though|although|but|and|or).*$', '', item, flags=re.I)
-            return item
+    item = _extract_item(answer)
+    if item is not None:
+        return item
     
     # If not in answer, try to find the character file and extract from event text
     # This would require knowing the character file path, which we might not have
@@ -119,16 +242,252 @@ def extract_contextual_item(answer: str, question_data: Dict) -> Optional[str]:
     return None
 
 
+def _find_quoted(text: str, quote: str = "'") -> Optional[str]:
+    """Return the first non-empty quoted span in text (like 'Observer Effect'), or None."""
+    start = text.find(quote)
+    while start >= 0:
+        end = text.find(quote, start + 1)
+        if end < 0:
+            return None
+        if end > start + 1:
+            return text[start + 1:end]
+        # Empty quotes: the closing quote may open the next span
+        start = end
+    return None
+
+
+def _replace_found_episode(template: str, learned_pattern: Dict, episode: str,
+                           allow_unquoted: bool = False) -> str:
+    """
+    Replace an episode name found in the template (which may differ from the
+    question_data episode) with a placeholder.
+    """
+    # Look for quoted episode names like 'Observer Effect'
+    found_episode = _find_quoted(template)
+    if not found_episode and allow_unquoted:
+        # Try without quotes
+        episode_match = EPISODE_WORD_PATTERN.search(template)
+        if episode_match:
+            found_episode = episode_match.group(1)
+    if found_episode:
+        template = template.replace(found_episode, '{episode}')
+        if found_episode != episode:
+            learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
+    return template
+
+
+# Handlers for each contextual item pattern type. Each replaces the item in the
+# template, records what it learned in learned_pattern, and returns the template.
+
+def _handle_temporal_detail(template: str, item: str, item_pattern_type: str,
+                            learned_pattern: Dict, question_data: Dict) -> str:
+    # Replace the temporal detail phrase
+    template = template.replace(item, '{temporal_detail}')
+    learned_pattern['contextual_item'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Temporal detail is specific to this event - must be extracted from source event text when applying template'
+    return template
+
+
+def _handle_task_question(template: str, item: str, item_pattern_type: str,
+                          learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item is the character being asked about; the task/answer comes from the event text
+    template = template.replace(item, '{subject_character}')
+    learned_pattern['subject_character'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Task question - subject character may differ from question character. Task/answer must be extracted from source event text.'
+    return template
+
+
+def _handle_who_question(template: str, item: str, item_pattern_type: str,
+                         learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item is the event description; the answer is a character name
+    template = template.replace(item, '{event_description}')
+    learned_pattern['event_description'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Who question - event description must be extracted from source event text. Answer is a character name.'
+    learned_pattern['answer_type'] = 'character'
+    return _replace_found_episode(template, learned_pattern, question_data.get('episode', ''))
+
+
+def _handle_successor_question(template: str, item: str, item_pattern_type: str,
+                               learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item is the relationship/role description; the answer is a character name
+    # Pattern: "who was his successor in the role of overseeing the Enterprise"
+    # or "was the successor of which officer"
+    learned_pattern['relationship_description'] = item if item else 'successor relationship'
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Successor question - relationship description must be extracted from source event text. Answer is a character name.'
+    learned_pattern['answer_type'] = 'character'
+    
+    # Look for successor character names in the template (like "Admiral Gardner was the successor")
+    successor_match = SUCCESSOR_NAME_PATTERN.search(template)
+    if successor_match:
+        successor_name = successor_match.group(1)
+        template = template.replace(successor_name, '{successor_character}')
+        learned_pattern['successor_character'] = successor_name
+    
+    return _replace_found_episode(template, learned_pattern, question_data.get('episode', ''), allow_unquoted=True)
+
+
+def _handle_detail_what_question(template: str, item: str, item_pattern_type: str,
+                                 learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item is the detail being asked about; the answer is a specific detail (like "coin")
+    template = template.replace(item, '{detail_type}')
+    learned_pattern['detail_type'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Detail/What question - detail type must be extracted from source event text. Answer is a specific detail.'
+    learned_pattern['answer_type'] = 'detail'
+    
+    # Also look for named details like "called his lucky loonie"
+    named_detail_match = NAMED_DETAIL_PATTERN.search(template)
+    if named_detail_match:
+        named_detail = named_detail_match.group(1).strip()
+        template = template.replace(named_detail, '{named_detail}')
+        learned_pattern['named_detail'] = named_detail
+    
+    return _replace_found_episode(template, learned_pattern, question_data.get('episode', ''), allow_unquoted=True)
+
+
+def _handle_named_detail(template: str, item: str, item_pattern_type: str,
+                         learned_pattern: Dict, question_data: Dict) -> str:
+    template = template.replace(item, '{named_detail}')
+    learned_pattern['named_detail'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Named detail question - detail name must be extracted from source event text.'
+    learned_pattern['answer_type'] = 'detail'
+    return template
+
+
+def _handle_revealed_detail_question(template: str, item: str, item_pattern_type: str,
+                                     learned_pattern: Dict, question_data: Dict) -> str:
+    # The full statement is kept as learned context; this is a complex question structure
+    learned_pattern['revealed_statement'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Revealed detail question - full statement must be extracted from source event text. Answer is a specific detail.'
+    learned_pattern['answer_type'] = 'detail'
+    return _replace_found_episode(template, learned_pattern, question_data.get('episode', ''), allow_unquoted=True)
+
+
+def _handle_exoneration_question(template: str, item: str, item_pattern_type: str,
+                                 learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item describes who was exonerated; the answer is that character's name
+    template = template.replace(item, '{exonerated_description}')
+    learned_pattern['exonerated_description'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Exoneration question - description of exonerated person must be extracted from source event text. Answer is a character name.'
+    learned_pattern['answer_type'] = 'character'
+    
+    # Extract the character who did the exonerating (if mentioned)
+    exoneration_match = EXONERATION_CHARACTER_PATTERN.search(template)
+    if exoneration_match:
+        exoneration_character = exoneration_match.group(1)
+        template = template.replace(exoneration_character, '{exoneration_character}')
+        learned_pattern['exoneration_character'] = exoneration_character
+    return template
+
+
+def _handle_nickname_question(template: str, item: str, item_pattern_type: str,
+                              learned_pattern: Dict, question_data: Dict) -> str:
+    # The answer is the nickname itself, so nothing in the template needs replacing
+    learned_pattern['nickname_description'] = item if item else 'nickname'
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Nickname question - nickname must be extracted from source event text. Answer is the nickname itself.'
+    learned_pattern['answer_type'] = 'nickname'
+    return template
+
+
+def _handle_nickname_reverse_question(template: str, item: str, item_pattern_type: str,
+                                      learned_pattern: Dict, question_data: Dict) -> str:
+    # The nickname is in the question and the answer is the character name
+    nickname_only = item.strip('",').split(',')[0].strip()  # Extract just "Often Wrong" from "Often Wrong," a play..."
+    template = template.replace(item, '{nickname}')
+    # Also replace just the nickname if it appears separately
+    if nickname_only and nickname_only != item:
+        template = template.replace(nickname_only, '{nickname}')
+    learned_pattern['nickname'] = nickname_only if nickname_only else item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Reversed nickname question - nickname is in question, answer is character name. Easier difficulty than asking for nickname.'
+    learned_pattern['answer_type'] = 'character'
+    learned_pattern['difficulty'] = 'easy'
+    return template
+
+
+def _handle_quote_what_question(template: str, item: str, item_pattern_type: str,
+                                learned_pattern: Dict, question_data: Dict) -> str:
+    # The contextual item is what was said (already replaced with {statement_content}
+    # before names were); the answer is a specific detail from the statement
+    learned_pattern['statement_content'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Quote/What question - statement content must be extracted from source event text. Answer is a specific detail from the statement.'
+    learned_pattern['answer_type'] = 'detail'
+    return _replace_found_episode(template, learned_pattern, question_data.get('episode', ''))
+
+
+def _handle_contextual_item(template: str, item: str, item_pattern_type: str,
+                            learned_pattern: Dict, question_data: Dict) -> str:
+    template = template.replace(item, '{item}')
+    learned_pattern['contextual_item'] = item
+    learned_pattern['item_pattern'] = item_pattern_type
+    learned_pattern['note'] = 'Contextual item is specific to this event - must be extracted from source event text when applying template'
+    return template
+
+
+ITEM_HANDLERS = {
+    'temporal_detail': _handle_temporal_detail,
+    'task_question': _handle_task_question,
+    'who_question': _handle_who_question,
+    'successor_question': _handle_successor_question,
+    'detail_what_question': _handle_detail_what_question,
+    'named_detail': _handle_named_detail,
+    'revealed_detail_question': _handle_revealed_detail_question,
+    'exoneration_question': _handle_exoneration_question,
+    'nickname_question': _handle_nickname_question,
+    'nickname_reverse_question': _handle_nickname_reverse_question,
+    'quote_what_question': _handle_quote_what_question,
+}
+
+
+@lru_cache(maxsize=1024)
+def _compile_names_pattern(names: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile an alternation matching any of names (given longest first).
+    A possessive like "Name's" needs no alternative of its own: replacing "Name"
+    leaves the "'s" in place. Cached because the same character/series/episode
+    combinations come up again and again.
+    """
+    return re.compile('|'.join(map(re.escape, names)))
+
+
 def apply_correction(original_question: str, corrected_question: str, 
                     question_data: Dict) -> Dict:
     """
     Analyze a correction and extract patterns to learn from.
     Returns a pattern that can be added to the library.
     """
-    # Extract what changed
-    original_lower = original_question.lower()
-    corrected_lower = corrected_question.lower()
-    
+    # Re-submitted corrections (e.g. reprocessing a session) are answered from the cache
+    try:
+        question_items = tuple(sorted(question_data.items()))
+        hash(question_items)
+    except TypeError:
+        # Unhashable (or unsortable) question data can't be a cache key
+        return _apply_correction(original_question, corrected_question, question_data)
+    
+    learned_pattern = _apply_correction_cached(original_question, corrected_question, question_items)
+    # Copy so callers can modify the result without touching the cached pattern
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in learned_pattern.items()}
+
+
+@lru_cache(maxsize=4096)
+def _apply_correction_cached(original_question: str, corrected_question: str,
+                             question_items: Tuple) -> Dict:
+    """Cached apply_correction for question data given as sorted (key, value) pairs."""
+    return _apply_correction(original_question, corrected_question, dict(question_items))
+
+
+def _apply_correction(original_question: str, corrected_question: str,
+                      question_data: Dict) -> Dict:
+    """Uncached implementation of apply_correction."""
     # Identify the pattern
     learned_pattern = {
         'original_template': original_question,
@@ -141,6 +500,11 @@ def apply_correction(original_question: str, corrected_question: str,
         'answer': question_data.get('answer', ''),
     }
     
+    # Nothing was corrected, so there is no pattern to learn
+    if original_question == corrected_question:
+        learned_pattern['generalized_template'] = corrected_question
+        return learned_pattern
+    
     # Try to generalize the template
     # Replace specific values with placeholders
     char_name = question_data.get('character', '')
@@ -149,342 +513,213 @@ def apply_correction(original_question: str, corrected_question: str,
     
     template = corrected_question
     
-    # First, extract contextual items that might contain character names
-    # This needs to happen before character name replacement
+    # Extract contextual items (like "Bularian canapés", "Sir-Neighs-a-Lot") first, since
+    # they might contain character names. The contextual item is specific to THIS event,
+    # not a general template, so it is extracted from the corrected question itself
     contextual_item = None
     item_pattern_type = None
     
-    # Look for patterns in the corrected question (preliminary check)
-    patterns_to_check = [
-        (r'said that ([^?]+) was what\?', 'quote_what_question'),
-        (r'said that ([^?]+)\?', 'quote_what_question'),
-    ]
+    # Look for patterns in the corrected question (first pattern in list order wins).
+    # Patterns are searched one at a time on purpose: each keeps the regex engine's
+    # literal-prefix scan, which a combined alternation loses - a single mega-regex
+    # measured 3-5x slower here, and leftmost-match alternation also changes which
+    # pattern wins.
+    if corrected_question.isascii():
+        # Lowercasing ASCII keeps every offset, so case-sensitive patterns run on the lowercase
+        # text and match spans map straight back onto the original (capitalized) question.
+        # A question without any anchor literal can't match, so it skips the regexes entirely.
+        corrected_lower = corrected_question.lower()
+        search_text = corrected_lower
+        patterns = EXTRACT_PATTERNS if any(anchor in corrected_lower for anchor in EXTRACT_ANCHORS) else ()
+    else:
+        # Non-ASCII lowercasing can change lengths and re.I folds some non-ASCII letters
+        search_text = corrected_question
+        patterns = EXTRACT_PATTERNS_IGNORECASE
     
-    for pattern, pattern_type in patterns_to_check:
-        item_match = re.search(pattern, corrected_question, re.I)
+    for pattern, pattern_type in patterns:
+        item_match = pattern.search(search_text)
         if item_match:
-            contextual_item = item_match.group(1).strip()
+            # Some patterns don't have capture groups (like "was referred to be this similar-sounding nickname")
+            if item_match.groups():
+                contextual_item = corrected_question[item_match.start(1):item_match.end(1)].strip()
+                # Clean up trailing punctuation
+                contextual_item = contextual_item.rstrip('?.,;')
+            else:
+                # Pattern matched but no capture group - use empty string or pattern-specific handling
+                contextual_item = ""
             item_pattern_type = pattern_type
             break
     
-    # If we found a quote/what question, replace the statement content first
+    # A quoted statement can contain names too, so replace it before the name pass
     if item_pattern_type == 'quote_what_question' and contextual_item:
         template = template.replace(contextual_item, '{statement_content}')
     
-    # Replace character name (after statement content replacement)
+    # Replace character name, series (abbreviation and full name) and episode in one pass;
+    # longer names are tried first, so "Data's Day" wins over "Data" at the same position
+    # and a placeholder inserted for one name is never rewritten by another
+    substitutions = {}
     if char_name:
-        template = template.replace(char_name, '{character}')
-        # Also handle possessive forms
-        if char_name.endswith('s'):
-            template = template.replace(char_name + "'s", "{character}'s")
-        else:
-            template = template.replace(char_name + "'s", "{character}'s")
-    
-    # Replace series (handle both abbreviations and full names)
+        substitutions.setdefault(char_name, '{character}')
     if series:
-        template = template.replace(series, '{series}')
+        substitutions.setdefault(series, '{series}')
         # Also handle common series name mappings
-        series_name_map = {
-            'ENT': 'Enterprise',
-            'TNG': 'The Next Generation',
-            'TOS': 'The Original Series',
-            'DS9': 'Deep Space Nine',
-            'VOY': 'Voyager',
-            'DIS': 'Discovery',
-            'SNW': 'Strange New Worlds',
-            'LD': 'Lower Decks',
-            'PRO': 'Prodigy',
-        }
-        if series in series_name_map:
-            full_name = series_name_map[series]
-            template = template.replace(full_name, '{series_name}')
+        full_name = SERIES_NAME_MAP.get(series)
+        if full_name:
+            substitutions.setdefault(full_name, '{series_name}')
             learned_pattern['series_name_mapping'] = {series: full_name}
-    
-    # Replace episode
     if episode:
-        template = template.replace(episode, '{episode}')
-        # Also handle quoted episodes
-        template = template.replace(f'"{episode}"', '"{episode}"')
-    
-    # Extract and replace contextual items (like "Bularian canapés", "Sir-Neighs-a-Lot")
-    # The contextual item is specific to THIS event, not a general template
-    # Extract it from the corrected question itself
-    # (Skip if we already extracted quote_what_question above)
-    if item_pattern_type != 'quote_what_question':
-        contextual_item = None
-        item_pattern_type = None
-    
-    # Look for patterns in the corrected question
-    patterns_to_extract = [
-        (r'fondness for ([^?]+)', 'fondness_for'),
-        (r'preference for ([^?]+)', 'preference_for'),
-        (r'interest in ([^?]+)', 'interest_in'),
-        (r'liking for ([^?]+)', 'liking_for'),
-        (r'this character was nicknamed "([^"]+)"', 'nickname_reverse_question'),  # "this character was nicknamed \"Often Wrong\""
-        (r'this character was nicknamed ([^,]+),', 'nickname_reverse_question'),  # "this character was nicknamed X,"
-        (r'pony, ([^?]+)', 'pony_name'),  # "pony, Sir-Neighs-a-Lot"
-        (r'pony named ([^?]+)', 'pony_name'),  # "pony named X"
-        (r'named ([^?]+)', 'named_item'),  # Generic "named X" (must come after nickname patterns)
-        (r'born (sometime during the \d{4}s)', 'temporal_detail'),  # "born sometime during the 2360s"
-        (r'born (in \d{4})', 'temporal_detail'),  # "born in 2367"
-        (r'(\d{4}s)', 'temporal_detail'),  # Generic "2360s" as contextual detail
-        (r'what task is ([^?]+) attempting to accomplish\?', 'task_question'),  # "what task is X attempting to accomplish?"
-        (r'what is ([^?]+) attempting to (find|accomplish|do|solve)', 'task_question'),  # "what is X attempting to find?"
-        (r'which crew member ([^?]+)\?', 'who_question'),  # "which crew member was infected..."
-        (r'which character ([^?]+)\?', 'who_question'),  # "which character..."
-        (r'which officer ([^?]+)\?', 'who_question'),  # "which officer..."
-        (r'who ([^?]+)\?', 'who_question'),  # "who was..."
-        (r'who was ([^?]+) successor', 'successor_question'),  # "who was his successor"
-        (r'was the successor of which ([^?]+)\?', 'successor_question'),  # "was the successor of which officer?"
-        (r'said that ([^?]+) was what\?', 'quote_what_question'),  # "said that X was what?"
-        (r'said that ([^?]+)\?', 'quote_what_question'),  # "said that X?"
-        (r'had a valued family heirloom in the form of this type of ([^,]+), called', 'detail_what_question'),  # "had a valued family heirloom in the form of this type of coin, called"
-        (r'in the form of this type of ([^,]+), called', 'detail_what_question'),  # "in the form of this type of X, called"
-        (r'called his "([^"]+)"', 'named_detail'),  # "called his \"lucky loonie\""
-        (r'called his ([^?]+)\?', 'named_detail'),  # "called his lucky loonie?"
-        (r'it is revealed that ([^?]+) had', 'revealed_detail_question'),  # "it is revealed that X had"
-        (r'was instrumental in leading an elite team that exonerated this ([^?]+)\?', 'exoneration_question'),  # "was instrumental in leading an elite team that exonerated this falsely accused Captain"
-        (r'exonerated this ([^?]+)\?', 'exoneration_question'),  # "exonerated this falsely accused Captain"
-        (r'was referred to be this similar-sounding nickname', 'nickname_question'),  # "was referred to be this similar-sounding nickname"
-        (r'was referred to by this ([^?]+)\?', 'nickname_question'),  # "was referred to by this nickname?"
-        (r'was known by this ([^?]+)\?', 'nickname_question'),  # "was known by this nickname?"
-        (r'this character was nicknamed "([^"]+)"', 'nickname_reverse_question'),  # "this character was nicknamed \"Often Wrong\""
-        (r'this character was nicknamed ([^,]+),', 'nickname_reverse_question'),  # "this character was nicknamed X,"
-    ]
-    
-    for pattern, pattern_type in patterns_to_extract:
-        item_match = re.search(pattern, corrected_question, re.I)
-        if item_match:
-            # Some patterns don't have capture groups (like "was referred to be this similar-sounding nickname")
-            if item_match.groups():
-                contextual_item = item_match.group(1).strip()
-                # Clean up trailing punctuation
-                contextual_item = contextual_item.rstrip('?.,;')
-            else:
-                # Pattern matched but no capture group - use empty string or pattern-specific handling
-                contextual_item = ""
-            item_pattern_type = pattern_type
-            break
+        substitutions.setdefault(episode, '{episode}')
+    
+    if substitutions:
+        names_pattern = _compile_names_pattern(tuple(sorted(substitutions, key=len, reverse=True)))
+        template = names_pattern.sub(lambda match: substitutions[match.group(0)], template)
     
     if contextual_item:
-        # Replace the specific item with a placeholder
-        # Be careful with replacements - use word boundaries to avoid partial matches
-        # For temporal details, we might need to replace the whole phrase
-        if item_pattern_type == 'temporal_detail':
-            # Replace the temporal detail phrase
-            template = template.replace(contextual_item, '{temporal_detail}')
-            learned_pattern['contextual_item'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Temporal detail is specific to this event - must be extracted from source event text when applying template'
-        elif item_pattern_type == 'task_question':
-            # For task questions, the contextual item is the character being asked about
-            # The actual task/answer comes from the event text
-            # Replace the subject character with placeholder
-            template = template.replace(contextual_item, '{subject_character}')
-            learned_pattern['subject_character'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Task question - subject character may differ from question character. Task/answer must be extracted from source event text.'
-        elif item_pattern_type == 'who_question':
-            # For "who" questions, the contextual item is the event description
-            # The answer is a character name
-            # Replace the event description with placeholder
-            template = template.replace(contextual_item, '{event_description}')
-            learned_pattern['event_description'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Who question - event description must be extracted from source event text. Answer is a character name.'
-            learned_pattern['answer_type'] = 'character'
-            
-            # Also replace any episode name that appears in the template (may differ from question_data episode)
-            # Look for quoted episode names like 'Observer Effect'
-            episode_match = re.search(r"'([^']+)'", template)
-            if episode_match:
-                # Replace the episode name found in quotes with placeholder
-                # This handles cases where the corrected question uses a different episode than question_data
-                found_episode = episode_match.group(1)
-                template = template.replace(found_episode, '{episode}')
-                if found_episode != episode:
-                    learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
-        elif item_pattern_type == 'successor_question':
-            # For successor questions, the contextual item is the relationship/role description
-            # The answer is a character name (the predecessor or successor)
-            # Extract the role/relationship description
-            # Pattern: "who was his successor in the role of overseeing the Enterprise"
-            # or "was the successor of which officer"
-            learned_pattern['relationship_description'] = contextual_item if contextual_item else 'successor relationship'
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Successor question - relationship description must be extracted from source event text. Answer is a character name.'
-            learned_pattern['answer_type'] = 'character'
-            
-            # Look for successor character names in the template (like "Admiral Gardner")
-            # Pattern: "Admiral Gardner was the successor"
-            successor_match = re.search(r'(\w+\s+\w+)\s+was the successor', template, re.I)
-            if successor_match:
-                successor_name = successor_match.group(1)
-                template = template.replace(successor_name, '{successor_character}')
-                learned_pattern['successor_character'] = successor_name
-            
-            # Also replace any episode name that appears in the template
-            episode_match = re.search(r"'([^']+)'", template)
-            if not episode_match:
-                # Try without quotes
-                episode_match = re.search(r'episode\s+(\w+)', template, re.I)
-            if episode_match:
-                found_episode = episode_match.group(1)
-                template = template.replace(found_episode, '{episode}')
-                if found_episode != episode:
-                    learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
-        elif item_pattern_type == 'detail_what_question':
-            # For detail/what questions, the contextual item is the detail being asked about
-            # The answer is a specific detail (like "coin" or "loonie")
-            # Replace the detail description with placeholder
-            template = template.replace(contextual_item, '{detail_type}')
-            learned_pattern['detail_type'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Detail/What question - detail type must be extracted from source event text. Answer is a specific detail.'
-            learned_pattern['answer_type'] = 'detail'
-            
-            # Also look for named details like "called his lucky loonie"
-            named_detail_match = re.search(r'called his "?([^"?]+)"?\?', template, re.I)
-            if named_detail_match:
-                named_detail = named_detail_match.group(1).strip()
-                template = template.replace(named_detail, '{named_detail}')
-                learned_pattern['named_detail'] = named_detail
-            
-            # Also replace any episode name that appears in the template
-            episode_match = re.search(r"'([^']+)'", template)
-            if not episode_match:
-                episode_match = re.search(r'episode\s+(\w+)', template, re.I)
-            if episode_match:
-                found_episode = episode_match.group(1)
-                template = template.replace(found_episode, '{episode}')
-                if found_episode != episode:
-                    learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
-        elif item_pattern_type == 'named_detail':
-            # For named detail questions, extract the name
-            template = template.replace(contextual_item, '{named_detail}')
-            learned_pattern['named_detail'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Named detail question - detail name must be extracted from source event text.'
-            learned_pattern['answer_type'] = 'detail'
-        elif item_pattern_type == 'revealed_detail_question':
-            # For "it is revealed that" questions, extract the full statement
-            # This is a complex question structure
-            learned_pattern['revealed_statement'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Revealed detail question - full statement must be extracted from source event text. Answer is a specific detail.'
-            learned_pattern['answer_type'] = 'detail'
-            
-            # Replace episode name
-            episode_match = re.search(r"'([^']+)'", template)
-            if not episode_match:
-                episode_match = re.search(r'episode\s+(\w+)', template, re.I)
-            if episode_match:
-                found_episode = episode_match.group(1)
-                template = template.replace(found_episode, '{episode}')
-                if found_episode != episode:
-                    learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
-        elif item_pattern_type == 'exoneration_question':
-            # For exoneration questions, the contextual item is the description of who was exonerated
-            # The answer is a character name (the person who was exonerated)
-            # Replace the description with placeholder
-            template = template.replace(contextual_item, '{exonerated_description}')
-            learned_pattern['exonerated_description'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Exoneration question - description of exonerated person must be extracted from source event text. Answer is a character name.'
-            learned_pattern['answer_type'] = 'character'
-            
-            # Extract the character who did the exonerating (if mentioned)
-            exoneration_match = re.search(r'(\w+\s+\w+)\s+was instrumental in leading', template, re.I)
-            if exoneration_match:
-                exoneration_character = exoneration_match.group(1)
-                template = template.replace(exoneration_character, '{exoneration_character}')
-                learned_pattern['exoneration_character'] = exoneration_character
-        elif item_pattern_type == 'nickname_question':
-            # For nickname questions, the contextual item is the description of the nickname
-            # The answer is the nickname itself
-            # Pattern: "was referred to be this similar-sounding nickname" -> answer is the nickname
-            learned_pattern['nickname_description'] = contextual_item if contextual_item else 'nickname'
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Nickname question - nickname must be extracted from source event text. Answer is the nickname itself.'
-            learned_pattern['answer_type'] = 'nickname'
-            
-            # Look for the nickname pattern in the template
-            # The question structure might be: "was referred to be this similar-sounding nickname" -> answer is the nickname
-            # We don't need to replace anything in the template since the nickname is the answer, not in the question
-        elif item_pattern_type == 'nickname_reverse_question':
-            # For reversed nickname questions, the nickname is in the question, answer is the character
-            # Pattern: "this character was nicknamed 'Often Wrong'" -> answer is the character name
-            # Replace the nickname with placeholder (just the nickname, not the full phrase)
-            nickname_only = contextual_item.strip('",').split(',')[0].strip()  # Extract just "Often Wrong" from "Often Wrong," a play..."
-            template = template.replace(contextual_item, '{nickname}')
-            # Also replace just the nickname if it appears separately
-            if nickname_only and nickname_only != contextual_item:
-                template = template.replace(nickname_only, '{nickname}')
-            learned_pattern['nickname'] = nickname_only if nickname_only else contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Reversed nickname question - nickname is in question, answer is character name. Easier difficulty than asking for nickname.'
-            learned_pattern['answer_type'] = 'character'
-            learned_pattern['difficulty'] = 'easy'
-        elif item_pattern_type == 'quote_what_question':
-            # For quote/what questions, the contextual item is what was said/asked about
-            # The answer is a specific detail from the quote/statement
-            # Replace the statement content with placeholder
-            template = template.replace(contextual_item, '{statement_content}')
-            learned_pattern['statement_content'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Quote/What question - statement content must be extracted from source event text. Answer is a specific detail from the statement.'
-            learned_pattern['answer_type'] = 'detail'
-            
-            # Also replace any episode name that appears in the template
-            episode_match = re.search(r"'([^']+)'", template)
-            if episode_match:
-                found_episode = episode_match.group(1)
-                template = template.replace(found_episode, '{episode}')
-                if found_episode != episode:
-                    learned_pattern['episode_note'] = f'Corrected question uses episode "{found_episode}" instead of question_data episode "{episode}"'
-        else:
-            template = template.replace(contextual_item, '{item}')
-            learned_pattern['contextual_item'] = contextual_item
-            learned_pattern['item_pattern'] = item_pattern_type
-            learned_pattern['note'] = 'Contextual item is specific to this event - must be extracted from source event text when applying template'
+        # Replace the specific item with a placeholder using the handler for its pattern type
+        handler = ITEM_HANDLERS.get(item_pattern_type, _handle_contextual_item)
+        template = handler(template, contextual_item, item_pattern_type, learned_pattern, question_data)
     
     learned_pattern['generalized_template'] = template
     
     return learned_pattern
 
 
-def save_correction(correction: Dict, corrections_file: str = "data/question_corrections.json"):
-    """Save a correction to the corrections file."""
-    corrections_file_path = Path(corrections_file)
-    
-    if corrections_file_path.exists():
-        with open(corrections_file_path, 'r', encoding='utf-8') as f:
-            corrections = json.load(f)
-    else:
-        corrections = []
-    
-    corrections.append(correction)
-    
-    with open(corrections_file_path, 'w', encoding='utf-8') as f:
-        json.dump(corrections, f, indent=2, ensure_ascii=False)
+def _legacy_corrections_file(corrections_file: str) -> Path:
+    """Return the JSON array earlier versions saved corrections to, next to corrections_file."""
+    return Path(corrections_file).with_suffix('.json')
+
+
+def _read_legacy_corrections(corrections_file: str) -> List[Dict]:
+    """Read the corrections saved by earlier versions, oldest first."""
+    legacy_file = _legacy_corrections_file(corrections_file)
+    if not legacy_file.exists():
+        return []
+    with open(legacy_file, 'rb') as f:
+        return json_loads(f.read())
+
+
+# PRAGMA user_version of a database whose schema exists and legacy corrections are imported
+CORRECTIONS_DB_VERSION = 1
+
+
+def _initialize_corrections_db(corrections_file: str):
+    """
+    Create the corrections table and index if needed and, the first time, import the
+    corrections saved by earlier versions to question_corrections.json.
+    """
+    Path(corrections_file).parent.mkdir(parents=True, exist_ok=True)
+    with closing(sqlite3.connect(corrections_file)) as connection, connection:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS corrections ("
+            "id INTEGER PRIMARY KEY, question_type TEXT, source TEXT, data TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_corrections_type_source ON corrections (question_type, source)"
+        )
+        if connection.execute("PRAGMA user_version").fetchone()[0] < CORRECTIONS_DB_VERSION:
+            connection.executemany(
+                "INSERT INTO corrections (question_type, source, data) VALUES (?, ?, ?)",
+                (
+                    (correction.get('question_type'), correction.get('source'), json_dumps(correction))
+                    for correction in _read_legacy_corrections(corrections_file)
+                ),
+            )
+            # Set in the same transaction, so an interrupted import is simply redone
+            connection.execute(f"PRAGMA user_version = {CORRECTIONS_DB_VERSION}")
+
+
+def _open_corrections_db(corrections_file: str) -> sqlite3.Connection:
+    """Open the corrections database for writing, creating and initializing it if needed."""
+    _initialize_corrections_db(corrections_file)
+    return sqlite3.connect(corrections_file)
+
+
+def _open_corrections_db_readonly(corrections_file: str) -> Optional[sqlite3.Connection]:
+    """
+    Open the corrections database read-only, or return None if no corrections were ever
+    saved. Only the very first open (importing the legacy file) writes anything; after
+    that no schema statements are run.
+    """
+    corrections_path = Path(corrections_file)
+    if corrections_path.exists():
+        connection = sqlite3.connect(f"{corrections_path.resolve().as_uri()}?mode=ro", uri=True)
+        if connection.execute("PRAGMA user_version").fetchone()[0] >= CORRECTIONS_DB_VERSION:
+            return connection
+        connection.close()
+    elif not _legacy_corrections_file(corrections_file).exists():
+        return None
+    
+    _initialize_corrections_db(corrections_file)
+    return sqlite3.connect(f"{corrections_path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def save_correction(correction: Dict, corrections_file: str = "data/question_corrections.db"):
+    """Save a correction to the corrections database."""
+    # A single indexed insert, instead of rewriting every saved correction
+    with closing(_open_corrections_db(corrections_file)) as connection, connection:
+        connection.execute(
+            "INSERT INTO corrections (question_type, source, data) VALUES (?, ?, ?)",
+            (correction.get('question_type'), correction.get('source'), json_dumps(correction)),
+        )
     
     print(f"Correction saved to {corrections_file}")
 
 
-def load_corrections(corrections_file: str = "data/question_corrections.json") -> List[Dict]:
-    """Load all corrections from file."""
-    corrections_file_path = Path(corrections_file)
+def load_corrections(corrections_file: str = "data/question_corrections.db") -> List[Dict]:
+    """Load all corrections from the database, oldest first."""
+    connection = _open_corrections_db_readonly(corrections_file)
+    if connection is None:
+        return []
     
-    if not corrections_file_path.exists():
+    with closing(connection):
+        rows = connection.execute("SELECT data FROM corrections ORDER BY id")
+        return [json_loads(data) for data, in rows]
+
+
+def find_corrections(question_type: str, source: str,
+                     corrections_file: str = "data/question_corrections.db") -> List[Dict]:
+    """Load only the corrections for one (question type, source), using the database index."""
+    connection = _open_corrections_db_readonly(corrections_file)
+    if connection is None:
         return []
     
-    with open(corrections_file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with closing(connection):
+        rows = connection.execute(
+            "SELECT data FROM corrections WHERE question_type = ? AND source = ? ORDER BY id",
+            (question_type, source),
+        )
+        return [json_loads(data) for data, in rows]
 
 
-def generate_corrected_question(question_data: Dict, corrections: List[Dict]) -> Optional[str]:
+def compact_corrections(corrections_file: str = "data/question_corrections.db",
+                        output_file: str = "data/question_corrections_export.json"):
+    """
+    Write all corrections as a single pretty-printed JSON array for review. The default
+    output is not question_corrections.json, which holds legacy corrections to import.
+    """
+    corrections = load_corrections(corrections_file)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(corrections, f, indent=2, ensure_ascii=False)
+    
+    print(f"Wrote {len(corrections)} corrections to {output_file}")
+
+
+def index_corrections(corrections: List[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+    """Group corrections by (question type, source) so lookups don't scan every correction."""
+    corrections_index = {}
+    for correction in corrections:
+        key = (correction.get('question_type'), correction.get('source'))
+        corrections_index.setdefault(key, []).append(correction)
+    return corrections_index
+
+
+def generate_corrected_question(question_data: Dict,
+                                corrections_index: Dict[Tuple[str, str], List[Dict]]) -> Optional[str]:
     """
     Try to generate a corrected question based on learned patterns.
+    
+    corrections_index is built once with index_corrections().
     """
     question = question_data.get('question', '')
     answer = question_data.get('answer', '')
@@ -494,19 +729,19 @@ def generate_corrected_question(question_data: Dict, corrections: List[Dict]) ->
     question_type = question_data.get('type', '')
     source = question_data.get('source', '')
     
-    # Check if we have a similar correction
-    for correction in corrections:
-        # Match by question type and source
-        if (correction.get('question_type') == question_type and 
-            correction.get('source') == source):
-            
-            # Check if answer pattern matches
-            if 'fondness' in answer.lower():
-                # Use fondness template
-                item = extract_item_from_answer(answer, 'fondness')
-                if item and episode and series:
-                    template = "Which episode of {series} showed {character}'s particular fondness for {item}?"
-                    return template.format(series=series, character=character, item=item)
+    # Check if we have a similar correction (matched by question type and source)
+    if corrections_index.get((question_type, source)):
+        # Check which library patterns the answer mentions (in library order) and use
+        # the first template of the first one whose item can be extracted
+        answer_lower = answer.lower()
+        for pattern_key in PATTERN_LIBRARY:
+            if pattern_key not in answer_lower:
+                continue
+            item = extract_item_from_answer(answer, pattern_key)
+            if item and episode and series:
+                # e.g. "Which episode of {series} showed {character}'s particular fondness for {item}?"
+                return _render(PARSED_TEMPLATES[pattern_key][0],
+                               {'series': series, 'character': character, 'episode': episode, 'item': item})
     
     return None
 
@@ -527,8 +762,8 @@ if __name__ == "__main__":
     # Load question data if provided
     question_data = {}
     if len(sys.argv) > 3:
-        with open(sys.argv[3], 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(sys.argv[3], 'rb') as f:
+            data = json_loads(f.read())
             # Check if it's a list or single object
             if isinstance(data, list):
                 # Find matching question
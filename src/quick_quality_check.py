@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 """Quick quality check of questions for MVP readiness."""
-import json
 import random
 
-with open('data/questions_from_616_characters.json', 'r', encoding='utf-8') as f:
-    questions = json.load(f)
+import _fastjson
+
+with open('data/questions_from_616_characters.json', 'rb') as f:
+    questions = _fastjson.load(f)
 
 print("=" * 70)
 print("QUICK QUALITY CHECK FOR MVP")
 print("=" * 70)
 print(f"\nTotal questions: {len(questions):,}")
-print(f"Verified: {sum(1 for q in questions if q.get('verified', False)):,} ({100*sum(1 for q in questions if q.get('verified', False))/len(questions):.1f}%)")
+verified_count = sum(1 for q in questions if q.get('verified', False))
+print(f"Verified: {verified_count:,} ({100*verified_count/len(questions):.1f}%)")
 
 # Sample random questions
 sample = random.sample(questions, min(20, len(questions)))
@@ -4,24 +4,102 @@ Scan character pages for family-related fields to identify patterns.
 This will help expand the extraction to handle all family relationships.
 """
 
-import xml.etree.ElementTree as ET
+import mmap
+import os
 import sys
 import re
-import json
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import unescape
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-NS = '{http://www.mediawiki.org/xml/export-0.11/}'
+from _fastjson import dumps as json_dumps
 
+try:
+    import re2 as regex_engine  # Optional google-re2: linear-time automaton matching
+except ImportError:
+    regex_engine = re
+
+# The few page elements the scan needs, read straight from a page's raw XML
+PAGE_TITLE_RE = regex_engine.compile(rb'<title>([^<]*)</title>')
+PAGE_NS_RE = regex_engine.compile(rb'<ns>([^<]*)</ns>')
+PAGE_TEXT_RE = regex_engine.compile(rb'(?s)<text\b[^>]*?(?:/>|>(.*?)</text>)')
+
+# Character pages carry one of these sidebars
+SIDEBAR_MARKERS = ('sidebar individual', 'sidebar character')
+SIDEBAR_MARKER_BYTES = tuple(marker.encode('utf-8') for marker in SIDEBAR_MARKERS)
+
+# Bytes of dump per parallel scan task; small enough that a --max scan stops early
+CHUNK_SIZE = 64 << 20
+
+# Patterns are compiled once here rather than on every page. They avoid backreferences
+# and lookaround (flags are inline) so google-re2 can run them when it is installed
+LINK_RE = regex_engine.compile(r'\[\[([^\]]+)\]\]')
+TEMPLATE_RE = regex_engine.compile(r'\{\{[^\}]+\}\}')
+HTML_RE = regex_engine.compile(r'<[^>]+>')
+BR_RE = regex_engine.compile(r'(?i)<br\s*/?>')
+PAREN_RE = regex_engine.compile(r'\(([^)]+)\)')
+
+# Main sidebar family fields. Single-name fields map to a name, list fields to the
+# key their entries are collected under
+SINGLE_NAME_FIELDS = ('father', 'mother')
+LIST_FIELDS = {'spouse': 'spouse', 'children': 'children', 'sibling': 'siblings', 'relative': 'relative'}
+# Other family-related fields; every occurrence is collected under 'other_family'
+OTHER_FAMILY_FIELDS = (
+    'grandfather', 'grandmother', 'son', 'daughter', 'brother', 'sister', 'uncle', 'aunt',
+    'cousin', 'nephew', 'niece', 'grandson', 'granddaughter', 'son-in-law', 'daughter-in-law',
+)
+FAMILY_FIELDS = SINGLE_NAME_FIELDS + tuple(LIST_FIELDS) + OTHER_FAMILY_FIELDS
+
+# Finds every '| field =' of all family fields in one pass; group N matches FAMILY_FIELDS[N - 1].
+# FIELD_VALUE_RE then reads the value from where the match ends, which together behaves
+# exactly like a separate '| field = value' search per field
+FAMILY_FIELD_RE = regex_engine.compile(
+    r'(?i)\|\s*(?:' + '|'.join(f'({re.escape(field_name)})' for field_name in FAMILY_FIELDS) + r')\s*='
+)
+FIELD_VALUE_RE = regex_engine.compile(r'\s*([^\n]+)')
+
+# Substrings covering every family field name (main and other family fields)
+FAMILY_KEYWORDS = (
+    'father', 'mother', 'spouse', 'children', 'sibling', 'relative', 'son', 'daughter',
+    'brother', 'sister', 'uncle', 'aunt', 'cousin', 'nephew', 'niece',
+)
+
+@lru_cache(maxsize=131072)
 def clean_mediawiki_markup(text: str) -> str:
-    """Remove MediaWiki markup from text."""
+    """
+    Remove MediaWiki markup from text.
+    Cached: the same links (recurring characters, episodes) appear across many sidebars.
+    """
     # Remove links: [[Link]] or [[Link|Display]]
-    text = re.sub(r'\[\[([^\]]+)\]\]', lambda m: m.group(1).split('|')[-1], text)
+    text = LINK_RE.sub(lambda m: m.group(1).split('|')[-1], text)
     # Remove templates: {{template}}
-    text = re.sub(r'\{\{[^\}]+\}\}', '', text)
+    text = TEMPLATE_RE.sub('', text)
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
+    text = HTML_RE.sub('', text)
     return text.strip()
 
+def _parse_br_list(field_text: str) -> list:
+    """Parse a <br>-separated field value into name/relationship entries."""
+    entries = []
+    for part in BR_RE.split(field_text):
+        part = part.strip()
+        if part:
+            # Extract name and relationship
+            name_match = LINK_RE.search(part)
+            rel_match = PAREN_RE.search(part)
+            if name_match:
+                name = clean_mediawiki_markup(name_match.group(1))
+                relationship = clean_mediawiki_markup(rel_match.group(1)) if rel_match else None
+                entries.append({
+                    'name': name,
+                    'relationship': relationship,
+                    'raw': part[:200]
+                })
+    return entries
+
 def extract_family_fields(text: str) -> dict:
     """Extract all family-related fields from sidebar."""
     fields = {
@@ -37,129 +115,52 @@ def extract_family_fields(text: str) -> dict:
     # Look for family fields in sidebar (first 5000 chars)
     sidebar_text = text[:5000]
     
-    # Father
-    father_match = re.search(r'\|\s*father\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if father_match:
-        father_text = father_match.group(1)
-        # Extract links
-        father_links = re.findall(r'\[\[([^\]]+)\]\]', father_text)
-        if father_links:
-            fields['father'] = clean_mediawiki_markup(father_links[0])
+    # Every family field name contains one of FAMILY_KEYWORDS, so a sidebar without any
+    # can be skipped with substring checks (re.I also folds a few non-ASCII letters onto
+    # ASCII ones, so only ASCII text takes the shortcut)
+    if sidebar_text.isascii():
+        sidebar_lower = sidebar_text.lower()
+        if not any(keyword in sidebar_lower for keyword in FAMILY_KEYWORDS):
+            return fields
     
-    # Mother
-    mother_match = re.search(r'\|\s*mother\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if mother_match:
-        mother_text = mother_match.group(1)
-        mother_links = re.findall(r'\[\[([^\]]+)\]\]', mother_text)
-        if mother_links:
-            fields['mother'] = clean_mediawiki_markup(mother_links[0])
+    # Find the first value of each main field, and every value of each other family
+    # field, in a single pass over the sidebar
+    field_values = {}
+    other_values = {field_name: [] for field_name in OTHER_FAMILY_FIELDS}
+    other_ends = dict.fromkeys(OTHER_FAMILY_FIELDS, 0)
+    for field_match in FAMILY_FIELD_RE.finditer(sidebar_text):
+        field_name = FAMILY_FIELDS[field_match.lastindex - 1]
+        if field_name in other_values:
+            # Skip a field that starts inside the previous value of the same field,
+            # as a per-field '| field = value' finditer would
+            if field_match.start() < other_ends[field_name]:
+                continue
+        elif field_name in field_values:
+            continue
+        value_match = FIELD_VALUE_RE.match(sidebar_text, field_match.end())
+        if value_match:
+            if field_name in other_values:
+                other_values[field_name].append(value_match.group(1))
+                other_ends[field_name] = value_match.end()
+            else:
+                field_values[field_name] = value_match.group(1)
     
-    # Spouse
-    spouse_match = re.search(r'\|\s*spouse\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if spouse_match:
-        spouse_text = spouse_match.group(1)
-        # Split by <br> tags
-        spouse_parts = re.split(r'<br\s*/?>', spouse_text, flags=re.I)
-        for part in spouse_parts:
-            part = part.strip()
-            if part:
-                # Extract name and relationship
-                name_match = re.search(r'\[\[([^\]]+)\]\]', part)
-                rel_match = re.search(r'\(([^)]+)\)', part)
-                if name_match:
-                    name = clean_mediawiki_markup(name_match.group(1))
-                    relationship = clean_mediawiki_markup(rel_match.group(1)) if rel_match else None
-                    fields['spouse'].append({
-                        'name': name,
-                        'relationship': relationship,
-                        'raw': part[:200]
-                    })
-    
-    # Children
-    children_match = re.search(r'\|\s*children\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if children_match:
-        children_text = children_match.group(1)
-        # Split by <br> tags
-        children_parts = re.split(r'<br\s*/?>', children_text, flags=re.I)
-        for part in children_parts:
-            part = part.strip()
-            if part:
-                # Extract name and relationship
-                name_match = re.search(r'\[\[([^\]]+)\]\]', part)
-                rel_match = re.search(r'\(([^)]+)\)', part)
-                if name_match:
-                    name = clean_mediawiki_markup(name_match.group(1))
-                    relationship = clean_mediawiki_markup(rel_match.group(1)) if rel_match else None
-                    fields['children'].append({
-                        'name': name,
-                        'relationship': relationship,
-                        'raw': part[:200]
-                    })
-    
-    # Siblings
-    sibling_match = re.search(r'\|\s*sibling\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if sibling_match:
-        sibling_text = sibling_match.group(1)
-        sibling_parts = re.split(r'<br\s*/?>', sibling_text, flags=re.I)
-        for part in sibling_parts:
-            part = part.strip()
-            if part:
-                name_match = re.search(r'\[\[([^\]]+)\]\]', part)
-                rel_match = re.search(r'\(([^)]+)\)', part)
-                if name_match:
-                    name = clean_mediawiki_markup(name_match.group(1))
-                    relationship = clean_mediawiki_markup(rel_match.group(1)) if rel_match else None
-                    fields['siblings'].append({
-                        'name': name,
-                        'relationship': relationship,
-                        'raw': part[:200]
-                    })
+    # Father and mother: the first link is the name
+    for field_name in SINGLE_NAME_FIELDS:
+        if field_name in field_values:
+            name_match = LINK_RE.search(field_values[field_name])
+            if name_match:
+                fields[field_name] = clean_mediawiki_markup(name_match.group(1))
     
-    # Relative (catch-all for other relationships)
-    relative_match = re.search(r'\|\s*relative\s*=\s*([^\n]+)', sidebar_text, re.I)
-    if relative_match:
-        relative_text = relative_match.group(1)
-        relative_parts = re.split(r'<br\s*/?>', relative_text, flags=re.I)
-        for part in relative_parts:
-            part = part.strip()
-            if part:
-                # Extract name and relationship
-                name_match = re.search(r'\[\[([^\]]+)\]\]', part)
-                rel_match = re.search(r'\(([^)]+)\)', part)
-                if name_match:
-                    name = clean_mediawiki_markup(name_match.group(1))
-                    relationship = clean_mediawiki_markup(rel_match.group(1)) if rel_match else None
-                    fields['relative'].append({
-                        'name': name,
-                        'relationship': relationship,
-                        'raw': part[:200]
-                    })
+    # Spouse, children, siblings and relatives (catch-all for other relationships)
+    for field_name, key in LIST_FIELDS.items():
+        if field_name in field_values:
+            fields[key] = _parse_br_list(field_values[field_name])
     
     # Look for other family-related fields
-    family_field_patterns = [
-        r'\|\s*grandfather\s*=\s*([^\n]+)',
-        r'\|\s*grandmother\s*=\s*([^\n]+)',
-        r'\|\s*son\s*=\s*([^\n]+)',
-        r'\|\s*daughter\s*=\s*([^\n]+)',
-        r'\|\s*brother\s*=\s*([^\n]+)',
-        r'\|\s*sister\s*=\s*([^\n]+)',
-        r'\|\s*uncle\s*=\s*([^\n]+)',
-        r'\|\s*aunt\s*=\s*([^\n]+)',
-        r'\|\s*cousin\s*=\s*([^\n]+)',
-        r'\|\s*nephew\s*=\s*([^\n]+)',
-        r'\|\s*niece\s*=\s*([^\n]+)',
-        r'\|\s*grandson\s*=\s*([^\n]+)',
-        r'\|\s*granddaughter\s*=\s*([^\n]+)',
-        r'\|\s*son-in-law\s*=\s*([^\n]+)',
-        r'\|\s*daughter-in-law\s*=\s*([^\n]+)',
-    ]
-    
-    for pattern in family_field_patterns:
-        field_name = re.search(r'\|\s*(\w+)\s*=', pattern).group(1) if re.search(r'\|\s*(\w+)\s*=', pattern) else 'unknown'
-        matches = re.finditer(pattern, sidebar_text, re.I)
-        for match in matches:
-            field_text = match.group(1)
-            name_match = re.search(r'\[\[([^\]]+)\]\]', field_text)
+    for field_name, field_texts in other_values.items():
+        for field_text in field_texts:
+            name_match = LINK_RE.search(field_text)
             if name_match:
                 name = clean_mediawiki_markup(name_match.group(1))
                 fields['other_family'].append({
@@ -170,8 +171,105 @@ def extract_family_fields(text: str) -> dict:
     
     return fields
 
-def scan_characters(xml_path: str, character_names: list = None, max_pages: int = None) -> dict:
-    """Scan character pages for family fields."""
+def iter_pages(xml_path: str, markers: Optional[Iterable[bytes]] = None,
+               start: int = 0, end: Optional[int] = None,
+               namespace: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yield (title, namespace, text) for each page of a MediaWiki XML dump.
+    
+    The dump is memory-mapped and each page is located with plain byte searches, and
+    only its title, namespace and text are read - much cheaper than building an element
+    tree for every page. If markers are given, pages whose raw XML contains none of
+    them are skipped without being copied or decoded; likewise if namespace is given,
+    pages in any other namespace are skipped before their title and text are read.
+    start/end limit the scan to pages whose <page> tag begins in that byte range.
+    """
+    markers = tuple(markers) if markers else None
+    with open(xml_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dump:
+            # Pages are read front to back, so ask the kernel for aggressive read-ahead
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                dump.madvise(mmap.MADV_SEQUENTIAL)
+            if end is None:
+                end = len(dump)
+            page_start = dump.find(b'<page>', start, end)
+            while page_start >= 0:
+                page_end = dump.find(b'</page>', page_start)
+                if page_end < 0:
+                    break
+                next_start = dump.find(b'<page>', page_end, end)
+                
+                if not markers or any(dump.find(marker, page_start, page_end) >= 0 for marker in markers):
+                    # Elements are searched for in place, so the page itself is never copied
+                    ns_match = PAGE_NS_RE.search(dump, page_start, page_end)
+                    ns = ns_match.group(1).decode('utf-8') if ns_match else '0'
+                    if namespace is None or ns == namespace:
+                        title_match = PAGE_TITLE_RE.search(dump, page_start, page_end)
+                        text_match = PAGE_TEXT_RE.search(dump, page_start, page_end)
+                        title = unescape(title_match.group(1).decode('utf-8')) if title_match else ''
+                        text = unescape(text_match.group(1).decode('utf-8')) if text_match and text_match.group(1) else ''
+                        yield title, ns, text
+                
+                page_start = next_start
+
+def _dump_chunks(xml_path: str, chunk_size: int = CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """Split a dump into (start, end) byte ranges of about chunk_size, each starting at a <page> tag."""
+    with open(xml_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dump:
+            bounds = [0]
+            while bounds[-1] + chunk_size < size:
+                boundary = dump.find(b'<page>', bounds[-1] + chunk_size)
+                if boundary < 0:
+                    break
+                bounds.append(boundary)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def _scan_chunk(xml_path: str, start: int, end: int,
+                character_names: Optional[list]) -> List[Tuple[str, dict]]:
+    """Return (title, family fields) for each character page with family fields in one chunk."""
+    found = []
+    # Only process main namespace (0) articles; other pages are dropped before their text is decoded
+    for title, ns, text in iter_pages(xml_path, SIDEBAR_MARKER_BYTES, start, end, namespace='0'):
+        # Skip mirror/alternate universe variants
+        title_lower = title.lower()
+        if '(mirror)' in title_lower or '(alternate)' in title_lower:
+            continue
+        
+        # If character_names specified, only process those
+        if character_names:
+            if not any(name.lower() in title_lower for name in character_names):
+                continue
+        
+        # Check if this looks like a character page (has sidebar)
+        if text and any(marker in text for marker in SIDEBAR_MARKERS):
+            family_fields = extract_family_fields(text)
+            
+            # Only include if we found at least one family field
+            if any([
+                family_fields['father'],
+                family_fields['mother'],
+                family_fields['spouse'],
+                family_fields['children'],
+                family_fields['siblings'],
+                family_fields['relative'],
+                family_fields['other_family']
+            ]):
+                found.append((title, family_fields))
+    return found
+
+def scan_characters(xml_path: str, character_names: list = None, max_pages: int = None,
+                    output_file: Optional[str] = None) -> dict:
+    """
+    Scan character pages for family fields.
+    If output_file is given, each character is also written to it as a JSON line
+    ({"title": ..., <family fields>}) as soon as it is found.
+    """
     results = {}
     page_count = 0
     
@@ -182,74 +280,63 @@ def scan_characters(xml_path: str, character_names: list = None, max_pages: int
         print(f"Maximum pages to scan: {max_pages}")
     print()
     
-    for event, elem in ET.iterparse(xml_path, events=('start', 'end')):
-        if event == 'end' and elem.tag == f'{NS}page':
-            title_elem = elem.find(f'{NS}title')
-            ns_elem = elem.find(f'{NS}ns')
-            revision_elem = elem.find(f'{NS}revision')
-            
-            if title_elem is not None and revision_elem is not None:
-                title = title_elem.text or ''
-                ns = ns_elem.text if ns_elem is not None else '0'
-                
-                # Only process main namespace (0) articles
-                if ns != '0':
-                    elem.clear()
-                    continue
-                
-                # Skip mirror/alternate universe variants
-                if '(mirror)' in title.lower() or '(alternate)' in title.lower():
-                    elem.clear()
-                    continue
-                
-                # If character_names specified, only process those
-                if character_names:
-                    if not any(name.lower() in title.lower() for name in character_names):
-                        elem.clear()
-                        continue
-                
-                text_elem = revision_elem.find(f'{NS}text')
-                if text_elem is not None and text_elem.text:
-                    text = text_elem.text
-                    
-                    # Check if this looks like a character page (has sidebar)
-                    if 'sidebar individual' in text or 'sidebar character' in text:
-                        family_fields = extract_family_fields(text)
-                        
-                        # Only include if we found at least one family field
-                        if any([
-                            family_fields['father'],
-                            family_fields['mother'],
-                            family_fields['spouse'],
-                            family_fields['children'],
-                            family_fields['siblings'],
-                            family_fields['relative'],
-                            family_fields['other_family']
-                        ]):
-                            results[title] = family_fields
-                            print(f"[OK] {title}")
-                            if family_fields['spouse']:
-                                print(f"  Spouse: {len(family_fields['spouse'])}")
-                            if family_fields['children']:
-                                print(f"  Children: {len(family_fields['children'])}")
-                            if family_fields['relative']:
-                                print(f"  Relatives: {len(family_fields['relative'])}")
-                            if family_fields['other_family']:
-                                print(f"  Other family: {len(family_fields['other_family'])}")
-                            
-                            page_count += 1
-                            if max_pages and page_count >= max_pages:
-                                break
+    # Pages are independent, so chunks of the dump are scanned in parallel. Chunks are
+    # submitted one per worker and topped up as results come back in dump order, so once
+    # max_pages is reached only the chunks already running are left to finish
+    workers = os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    
+    def scanned_chunks() -> Iterator[List[Tuple[str, dict]]]:
+        """Yield each chunk's results in dump order, with at most one chunk per worker in flight."""
+        for start, end in _dump_chunks(xml_path):
+            pending.append(executor.submit(_scan_chunk, xml_path, start, end, character_names))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    
+    output = open(output_file, 'w', encoding='utf-8') if output_file else None
+    try:
+        for title, family_fields in chain.from_iterable(scanned_chunks()):
+            results[title] = family_fields
+            if output:
+                output.write(json_dumps({'title': title, **family_fields}) + '\n')
+            print(f"[OK] {title}")
+            if family_fields['spouse']:
+                print(f"  Spouse: {len(family_fields['spouse'])}")
+            if family_fields['children']:
+                print(f"  Children: {len(family_fields['children'])}")
+            if family_fields['relative']:
+                print(f"  Relatives: {len(family_fields['relative'])}")
+            if family_fields['other_family']:
+                print(f"  Other family: {len(family_fields['other_family'])}")
             
-            elem.clear()
+            page_count += 1
+            if max_pages and page_count >= max_pages:
+                break
+    finally:
+        for future in pending:
+            future.cancel()  # No-op for chunks that are running or done
+        executor.shutdown(wait=True)
+        if output:
+            output.close()
     
     return results
 
 def analyze_patterns(results: dict) -> dict:
     """Analyze extracted family fields to identify patterns."""
     analysis = {
-        'field_usage': defaultdict(int),
-        'relationship_types': defaultdict(int),
+        'field_usage': Counter(),
+        # Counted from a single generator so the counting loop runs inside Counter
+        'relationship_types': Counter(
+            item['relationship']
+            for fields in results.values()
+            for field_value in fields.values()
+            if isinstance(field_value, list)
+            for item in field_value
+            if isinstance(item, dict) and item.get('relationship')
+        ),
         'field_formats': defaultdict(list),
         'examples': {}
     }
@@ -258,14 +345,10 @@ def analyze_patterns(results: dict) -> dict:
         for field_name, field_value in fields.items():
             if field_value:
                 if isinstance(field_value, list):
-                    if field_value:
-                        analysis['field_usage'][field_name] += len(field_value)
-                        for item in field_value:
-                            if isinstance(item, dict) and 'relationship' in item:
-                                if item['relationship']:
-                                    analysis['relationship_types'][item['relationship']] += 1
-                            if isinstance(item, dict) and 'raw' in item:
-                                analysis['field_formats'][field_name].append(item['raw'])
+                    analysis['field_usage'][field_name] += len(field_value)
+                    for item in field_value:
+                        if isinstance(item, dict) and 'raw' in item:
+                            analysis['field_formats'][field_name].append(item['raw'])
                 else:
                     analysis['field_usage'][field_name] += 1
         
@@ -306,7 +389,9 @@ if __name__ == '__main__':
         print("No specific characters provided. Scanning sample of character pages...")
         max_pages = max_pages or 100
     
-    results = scan_characters(xml_path, character_names if character_names else None, max_pages)
+    # Each character is streamed to the JSON-lines file as it is found
+    results_file = 'data/family_fields_scan.jsonl'
+    results = scan_characters(xml_path, character_names if character_names else None, max_pages, results_file)
     
     print(f"\n{'='*80}")
     print(f"Scanned {len(results)} character pages with family fields")
@@ -325,19 +410,19 @@ if __name__ == '__main__':
     for rel_type, count in sorted(analysis['relationship_types'].items(), key=lambda x: -x[1]):
         print(f"  {rel_type}: {count}")
     
-    # Save results
+    # Save the analysis summary; per-character results are already in results_file
     output_file = 'data/family_fields_scan.json'
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'results': results,
+        f.write(json_dumps({
             'analysis': {
                 'field_usage': dict(analysis['field_usage']),
                 'relationship_types': dict(analysis['relationship_types']),
                 'total_characters': len(results)
             },
             'examples': analysis['examples']
-        }, f, indent=2, ensure_ascii=False)
+        }, pretty=True))
     
-    print(f"\nResults saved to: {output_file}")
+    print(f"\nResults saved to: {results_file}")
+    print(f"Summary saved to: {output_file}")
     print(f"Examples saved for: {', '.join(list(analysis['examples'].keys())[:10])}")
 
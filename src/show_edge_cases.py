@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """Show the 3 edge case unverified questions with their source data."""
-import json
 import os
 
+import _fastjson
+
 # Load questions
-with open('data/questions_from_616_characters.json', 'r', encoding='utf-8') as f:
-    questions = json.load(f)
+with open('data/questions_from_616_characters.json', 'rb') as f:
+    questions = _fastjson.load(f)
 
 unverified = [q for q in questions if not q.get('verified', True)]
 
@@ -28,29 +29,22 @@ print("=" * 70)
 char_dir = 'data/characters/bulk_extract_family_fixed_20251114-171343'
 edge_characters = ['B\'Etor', 'Duras, son of Ja\'rod', 'Kang']
 
+# Index the character files by name once, instead of re-reading the whole directory per character
+characters_by_name = {}
+for filename in os.listdir(char_dir):
+    if filename.endswith('.json') and filename != 'bulk_extraction_checkpoint.json':
+        with open(os.path.join(char_dir, filename), 'rb') as f:
+            data = _fastjson.load(f)
+        char = data.get('character', {})
+        # First file in directory order wins, as with the old per-character search
+        characters_by_name.setdefault(char.get('name'), char)
+
 for char_name in edge_characters:
-    # Find the file
-    safe_name = char_name.lower().replace(' ', '_').replace(',', '').replace('\'', '').replace(' ', '_')
-    possible_files = [
-        f"{safe_name}.json",
-        f"{char_name.lower().replace(' ', '_').replace(',', '_').replace('\'', '_')}.json",
-        f"{char_name.lower().replace(' ', '_').replace(',', '').replace('\'', '')}.json"
-    ]
-    
-    found = False
-    for filename in os.listdir(char_dir):
-        if filename.endswith('.json') and filename != 'bulk_extraction_checkpoint.json':
-            with open(os.path.join(char_dir, filename), 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data.get('character', {}).get('name') == char_name:
-                    found = True
-                    char = data.get('character', {})
-                    print(f"\n{char_name}:")
-                    print(f"  Siblings: {char.get('siblings', [])}")
-                    print(f"  Children: {char.get('children', [])}")
-                    print(f"  Spouses: {char.get('spouses', [])}")
-                    break
-    
-    if not found:
+    char = characters_by_name.get(char_name)
+    if char is not None:
+        print(f"\n{char_name}:")
+        print(f"  Siblings: {char.get('siblings', [])}")
+        print(f"  Children: {char.get('children', [])}")
+        print(f"  Spouses: {char.get('spouses', [])}")
+    else:
         print(f"\n{char_name}: NOT FOUND")
-
@@ -1,39 +1,52 @@
 #!/usr/bin/env python3
 """Show questions with their source character files and source data."""
-import json
 import os
+import re
 import sys
 
+import _fastjson
+
 questions_file = "data/questions_for_correction.json"
 characters_dir = "data/characters/bulk_extract_full_20251114-083000"
 
-with open(questions_file, "r", encoding="utf-8") as f:
-    questions = json.load(f)
+# Character name -> file name: spaces become underscores, apostrophes and parentheses are
+# dropped, then anything that isn't alphanumeric, '_' or '-' becomes an underscore
+SAFE_NAME_TABLE = str.maketrans({" ": "_", "'": None, "(": None, ")": None})
+UNSAFE_CHARS_RE = re.compile(r"[^\w-]")
 
-print(f"Total questions: {len(questions)}\n")
-print("=" * 80)
+# Stream the questions, keeping only the "In which episode did..." ones that are shown
+total_questions = 0
+episode_did_questions = []
+with open(questions_file, "rb") as f:
+    for q in _fastjson.iter_array(f):
+        total_questions += 1
+        if q["question"].startswith("In which episode did"):
+            episode_did_questions.append(q)
 
-# Group by character
-by_character = {}
-for q in questions:
-    char = q.get("character", "Unknown")
-    if char not in by_character:
-        by_character[char] = []
-    by_character[char].append(q)
+# List the character files once; each question is then a set lookup instead of a filesystem check
+character_files = (
+    {filename[:-len(".json")] for filename in os.listdir(characters_dir) if filename.endswith(".json")}
+    if os.path.isdir(characters_dir) else set()
+)
+# Character name -> file name stem, filled in as characters come up
+safe_names = {}
+
+print(f"Total questions: {total_questions}\n")
+print("=" * 80)
 
 # Show problematic "In which episode did..." questions first
 print("\n\n'In which episode did...' QUESTIONS (Need Review):")
 print("=" * 80)
 
-episode_did_questions = [q for q in questions if q["question"].startswith("In which episode did")]
-
 for i, q in enumerate(episode_did_questions, 1):
     char = q.get("character", "Unknown")
     source_type = q.get("source", "unknown")
     
-    # Find character file
-    safe_name = char.lower().replace(" ", "_").replace("'", "").replace("(", "").replace(")", "")
-    safe_name = "".join(c if c.isalnum() or c in "_-" else "_" for c in safe_name)
+    # Find character file (file names are derived once per character)
+    safe_name = safe_names.get(char)
+    if safe_name is None:
+        safe_name = UNSAFE_CHARS_RE.sub("_", char.lower().translate(SAFE_NAME_TABLE))
+        safe_names[char] = safe_name
     char_file = os.path.join(characters_dir, f"{safe_name}.json")
     
     print(f"\n{'='*80}")
@@ -45,10 +58,10 @@ for i, q in enumerate(episode_did_questions, 1):
     print(f"  Character File: {char_file}")
     
     # Try to load and show source data
-    if os.path.exists(char_file):
+    if safe_name in character_files:
         try:
-            with open(char_file, "r", encoding="utf-8") as f:
-                char_data = json.load(f)
+            with open(char_file, "rb") as f:
+                char_data = _fastjson.load(f)
             
             if source_type == "timeline_event":
                 # Find the relevant timeline event - check all possible sections
@@ -8,8 +8,17 @@ from episode_question_generator import is_episode_page, generate_episode_questio
 data = json.load(open('../data/extracted/extracted_data.json', 'r', encoding='utf-8'))
 pages = data['pages']
 
+# Lowercase each title once and find both test episodes in a single pass
+times_orphan = []
+accession = []
+for p in pages:
+    title = p.get('title', '').lower()
+    if 'time' in title and 'orphan' in title:
+        times_orphan.append(p)
+    if 'accession' in title and 'episode' in title:
+        accession.append(p)
+
 # Find Time's Orphan episode
-times_orphan = [p for p in pages if 'time' in p.get('title', '').lower() and 'orphan' in p.get('title', '').lower()]
 print("Searching for 'Time's Orphan' episode:")
 for p in times_orphan:
     print(f"  - {p['title']} (Series: {p.get('series', [])})")
@@ -43,7 +52,6 @@ if times_orphan:
 print(f"\n\n{'='*60}")
 print("Testing: Accession (episode)")
 print(f"{'='*60}")
-accession = [p for p in pages if 'accession' in p.get('title', '').lower() and 'episode' in p.get('title', '').lower()]
 if accession:
     ep = accession[0]
     print(f"Episode: {ep['title']}")
@@ -3,10 +3,54 @@
 Test question generation across multiple scenarios to identify patterns and issues.
 """
 
-import json
+import contextlib
+import io
+import re
 import sys
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Set, Tuple
 from trivia_generator import load_data, generate_trivia_questions
+from _fastjson import dumps as json_dumps
+
+try:
+    import ahocorasick  # Optional pyahocorasick: finds every pattern in a single pass
+except ImportError:
+    ahocorasick = None
+
+# Short answers containing one of these are likely fragments
+FRAGMENT_PATTERNS = (
+    'born on', 'named for', 'died in', 'created by',
+    'played by', 'voiced by', 'portrayed by'
+)
+# MediaWiki markup remnants; lowercasing never adds or removes these characters,
+# so they are searched for in the lowercased answer along with the fragment patterns
+MARKUP_TOKENS = ('[[', '{{', '<')
+
+if ahocorasick:
+    ANSWER_AUTOMATON = ahocorasick.Automaton()
+    for pattern in FRAGMENT_PATTERNS:
+        ANSWER_AUTOMATON.add_word(pattern, 'fragment')
+    for token in MARKUP_TOKENS:
+        ANSWER_AUTOMATON.add_word(token, 'markup')
+    ANSWER_AUTOMATON.make_automaton()
+else:
+    ANSWER_SCAN_RE = re.compile(
+        '(?P<fragment>' + '|'.join(map(re.escape, FRAGMENT_PATTERNS)) + ')'
+        '|(?P<markup>' + '|'.join(map(re.escape, MARKUP_TOKENS)) + ')'
+    )
+
+def _scan_answer(answer_lower: str) -> Tuple[bool, bool]:
+    """Return (has a fragment pattern, has markup) for a lowercased answer, in one pass."""
+    found: Set[str]
+    if ahocorasick:
+        found = {category for _, category in ANSWER_AUTOMATON.iter(answer_lower)}
+    else:
+        found = set()
+        for match in ANSWER_SCAN_RE.finditer(answer_lower):
+            found.add(match.lastgroup)
+            if len(found) == 2:
+                break
+    return 'fragment' in found, 'markup' in found
 
 # Test scenarios - diverse combinations to identify patterns
 TEST_SCENARIOS = [
@@ -73,44 +117,54 @@ TEST_SCENARIOS = [
     }
 ]
 
-def analyze_question_quality(question: Dict) -> Dict:
+class QualityMetrics:
+    """Quality metrics for a single question; __slots__ keeps each record small."""
+    __slots__ = ('answer_length', 'answer_is_fragment', 'answer_has_markup',
+                 'question_relevant', 'answer_complete', 'issues')
+    
+    def __init__(self, answer_length: int) -> None:
+        self.answer_length = answer_length
+        self.answer_is_fragment = False
+        self.answer_has_markup = False
+        self.question_relevant = True
+        self.answer_complete = True
+        self.issues: List[str] = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metrics as a plain dict, in field order."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+def analyze_question_quality(question: Dict[str, Any]) -> QualityMetrics:
     """Analyze quality metrics for a single question."""
-    answer = question.get('answer', '')
-    question_text = question.get('question', '')
-    source = question.get('source_page', '')
+    answer: str = question.get('answer', '')
+    question_text: str = question.get('question', '')
+    source: str = question.get('source_page', '')
     
     # Quality metrics
-    metrics = {
-        'answer_length': len(answer),
-        'answer_is_fragment': False,
-        'answer_has_markup': False,
-        'question_relevant': True,
-        'answer_complete': True,
-        'issues': []
-    }
+    metrics = QualityMetrics(answer_length=len(answer))
     
     # Check for fragments (very short or incomplete)
     if len(answer) < 10:
-        metrics['answer_is_fragment'] = True
-        metrics['answer_complete'] = False
-        metrics['issues'].append('Answer too short')
+        metrics.answer_is_fragment = True
+        metrics.answer_complete = False
+        metrics.issues.append('Answer too short')
     
-    # Check for common fragment patterns
-    fragment_patterns = [
-        'born on', 'named for', 'died in', 'created by',
-        'played by', 'voiced by', 'portrayed by'
-    ]
-    answer_lower = answer.lower()
-    if any(pattern in answer_lower for pattern in fragment_patterns):
-        if len(answer) < 30:  # Short answers with these patterns are likely fragments
-            metrics['answer_is_fragment'] = True
-            metrics['answer_complete'] = False
-            metrics['issues'].append('Answer appears to be fragment')
+    # Check for common fragment patterns and MediaWiki markup remnants. Only short
+    # answers can be fragments, so longer ones skip lowercasing and the pattern scan
+    # and just check for the markup tokens
+    if len(answer) < 30:
+        has_fragment_pattern, has_markup = _scan_answer(answer.lower())
+    else:
+        has_fragment_pattern = False
+        has_markup = any(token in answer for token in MARKUP_TOKENS)
+    if has_fragment_pattern:  # Short answers with these patterns are likely fragments
+        metrics.answer_is_fragment = True
+        metrics.answer_complete = False
+        metrics.issues.append('Answer appears to be fragment')
     
-    # Check for MediaWiki markup remnants
-    if '[[' in answer or '{{' in answer or '<' in answer:
-        metrics['answer_has_markup'] = True
-        metrics['issues'].append('Answer contains markup')
+    if has_markup:
+        metrics.answer_has_markup = True
+        metrics.issues.append('Answer contains markup')
     
     # Check question relevance (does it mention selected tags?)
     # This is basic - could be enhanced
@@ -124,6 +178,7 @@ def test_scenario(data: Dict, scenario: Dict, max_questions: int = 10) -> Dict:
     print(f"Description: {scenario['description']}")
     print(f"{'=' * 60}")
     
+    # Only question generation can fail; the analysis below runs outside the try
     try:
         questions = generate_trivia_questions(
             data,
@@ -137,59 +192,83 @@ def test_scenario(data: Dict, scenario: Dict, max_questions: int = 10) -> Dict:
             max_difficulty=0.8,
             max_questions=max_questions
         )
-        
-        # Analyze each question
-        analyzed_questions = []
-        for q in questions:
-            metrics = analyze_question_quality(q)
-            q['_quality_metrics'] = metrics
-            analyzed_questions.append(q)
-        
-        # Calculate summary statistics
-        total = len(analyzed_questions)
-        fragments = sum(1 for q in analyzed_questions if q['_quality_metrics']['answer_is_fragment'])
-        has_markup = sum(1 for q in analyzed_questions if q['_quality_metrics']['answer_has_markup'])
-        incomplete = sum(1 for q in analyzed_questions if not q['_quality_metrics']['answer_complete'])
-        avg_answer_length = sum(q['_quality_metrics']['answer_length'] for q in analyzed_questions) / total if total > 0 else 0
-        
-        # Print results
-        print(f"\nGenerated {total} questions")
-        print(f"Quality Metrics:")
-        print(f"  Fragments: {fragments}/{total} ({fragments/total*100:.1f}%)")
-        print(f"  Has Markup: {has_markup}/{total} ({has_markup/total*100:.1f}%)")
-        print(f"  Incomplete: {incomplete}/{total} ({incomplete/total*100:.1f}%)")
-        print(f"  Avg Answer Length: {avg_answer_length:.1f} chars")
-        
-        # Show sample questions
-        print(f"\nSample Questions:")
-        for i, q in enumerate(analyzed_questions[:5], 1):
-            print(f"\n  {i}. {q['question']}")
-            print(f"     Answer: {q['answer'][:100]}...")
-            print(f"     Difficulty: {q.get('difficulty_level', 'Unknown')} ({q.get('difficulty', 0):.2f})")
-            print(f"     Source: {q.get('source_page', 'Unknown')}")
-            if q['_quality_metrics']['issues']:
-                print(f"     Issues: {', '.join(q['_quality_metrics']['issues'])}")
-        
-        return {
-            'scenario': scenario['name'],
-            'description': scenario['description'],
-            'total_questions': total,
-            'fragments': fragments,
-            'has_markup': has_markup,
-            'incomplete': incomplete,
-            'avg_answer_length': avg_answer_length,
-            'questions': analyzed_questions
-        }
-        
     except Exception as e:
         print(f"ERROR: {e}")
-        import traceback
-        traceback.print_exc()
         return {
             'scenario': scenario['name'],
             'error': str(e),
             'total_questions': 0
         }
+    
+    if not questions:
+        print("ERROR: No questions generated")
+        return {
+            'scenario': scenario['name'],
+            'error': 'No questions generated',
+            'total_questions': 0
+        }
+    
+    # Analyze each question
+    analyzed_questions = []
+    for q in questions:
+        metrics = analyze_question_quality(q)
+        q['_quality_metrics'] = metrics
+        analyzed_questions.append(q)
+    
+    # Calculate summary statistics in a single pass
+    total = len(analyzed_questions)
+    fragments = has_markup = incomplete = answer_length_sum = 0
+    for q in analyzed_questions:
+        metrics = q['_quality_metrics']
+        fragments += metrics.answer_is_fragment
+        has_markup += metrics.answer_has_markup
+        incomplete += not metrics.answer_complete
+        answer_length_sum += metrics.answer_length
+    avg_answer_length = answer_length_sum / total if total > 0 else 0
+    
+    # Print results
+    print(f"\nGenerated {total} questions")
+    print(f"Quality Metrics:")
+    print(f"  Fragments: {fragments}/{total} ({fragments/total*100:.1f}%)")
+    print(f"  Has Markup: {has_markup}/{total} ({has_markup/total*100:.1f}%)")
+    print(f"  Incomplete: {incomplete}/{total} ({incomplete/total*100:.1f}%)")
+    print(f"  Avg Answer Length: {avg_answer_length:.1f} chars")
+    
+    # Show sample questions
+    print(f"\nSample Questions:")
+    for i, q in enumerate(analyzed_questions[:5], 1):
+        print(f"\n  {i}. {q['question']}")
+        print(f"     Answer: {q['answer'][:100]}...")
+        print(f"     Difficulty: {q.get('difficulty_level', 'Unknown')} ({q.get('difficulty', 0):.2f})")
+        print(f"     Source: {q.get('source_page', 'Unknown')}")
+        if q['_quality_metrics'].issues:
+            print(f"     Issues: {', '.join(q['_quality_metrics'].issues)}")
+    
+    return {
+        'scenario': scenario['name'],
+        'description': scenario['description'],
+        'total_questions': total,
+        'fragments': fragments,
+        'has_markup': has_markup,
+        'incomplete': incomplete,
+        'avg_answer_length': avg_answer_length,
+        'questions': analyzed_questions
+    }
+
+# Data for the scenarios run in this process (see _init_worker)
+_worker_data = None
+
+def _init_worker(data_path: str):
+    """Load the data once per worker process; forked workers inherit it from the parent."""
+    global _worker_data
+    if _worker_data is None:
+        _worker_data = load_data(data_path)
+
+def _run_scenario(scenario: Dict) -> Tuple[str, Dict]:
+    """Run one scenario in a worker and return its printed report along with its result."""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = test_scenario(_worker_data, scenario, max_questions=10)
+    return output.getvalue(), result
 
 def main():
     """Run all test scenarios and generate analysis report."""
@@ -203,58 +282,68 @@ def main():
     print("QUESTION GENERATION QUALITY TEST SUITE")
     print("=" * 60)
     print(f"\nLoading data from {data_path}...")
-    data = load_data(data_path)
-    print(f"Loaded {len(data.get('pages', []))} pages")
+    global _worker_data
+    _worker_data = load_data(data_path)
+    print(f"Loaded {len(_worker_data.get('pages', []))} pages")
     
-    # Run all test scenarios
+    # Scenarios are independent, so run them in parallel; each report is printed
+    # in scenario order once its scenario finishes
     results = []
-    for scenario in TEST_SCENARIOS:
-        result = test_scenario(data, scenario, max_questions=10)
-        results.append(result)
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(data_path,)) as executor:
+        for output, result in executor.map(_run_scenario, TEST_SCENARIOS):
+            sys.stdout.write(output)
+            results.append(result)
     
-    # Generate summary report
-    print(f"\n\n{'=' * 60}")
-    print("SUMMARY REPORT")
-    print("=" * 60)
-    
-    total_scenarios = len([r for r in results if r.get('total_questions', 0) > 0])
-    total_questions = sum(r.get('total_questions', 0) for r in results)
-    total_fragments = sum(r.get('fragments', 0) for r in results)
-    total_markup = sum(r.get('has_markup', 0) for r in results)
-    total_incomplete = sum(r.get('incomplete', 0) for r in results)
-    
-    print(f"\nOverall Statistics:")
-    print(f"  Scenarios Tested: {len(TEST_SCENARIOS)}")
-    print(f"  Successful Scenarios: {total_scenarios}")
-    print(f"  Total Questions Generated: {total_questions}")
-    print(f"  Fragment Rate: {total_fragments}/{total_questions} ({total_fragments/total_questions*100:.1f}%)" if total_questions > 0 else "  Fragment Rate: N/A")
-    print(f"  Markup Rate: {total_markup}/{total_questions} ({total_markup/total_questions*100:.1f}%)" if total_questions > 0 else "  Markup Rate: N/A")
-    print(f"  Incomplete Rate: {total_incomplete}/{total_questions} ({total_incomplete/total_questions*100:.1f}%)" if total_questions > 0 else "  Incomplete Rate: N/A")
-    
-    # Identify patterns
-    print(f"\n{'=' * 60}")
-    print("PATTERN ANALYSIS")
-    print("=" * 60)
-    
-    # Best scenarios (lowest fragment rate)
-    valid_results = [r for r in results if r.get('total_questions', 0) > 0]
-    if valid_results:
-        best_scenarios = sorted(valid_results, key=lambda x: x.get('fragments', 999) / x.get('total_questions', 1))[:3]
-        print(f"\nBest Scenarios (lowest fragment rate):")
-        for r in best_scenarios:
-            frag_rate = r.get('fragments', 0) / r.get('total_questions', 1) * 100
-            print(f"  {r['scenario']}: {frag_rate:.1f}% fragments")
+    # Build the summary and pattern report in memory and write it out in one go
+    # (each scenario report above is likewise written as a single block)
+    with contextlib.redirect_stdout(io.StringIO()) as report:
+        # Generate summary report
+        print(f"\n\n{'=' * 60}")
+        print("SUMMARY REPORT")
+        print("=" * 60)
+        
+        total_scenarios = len([r for r in results if r.get('total_questions', 0) > 0])
+        total_questions = sum(r.get('total_questions', 0) for r in results)
+        total_fragments = sum(r.get('fragments', 0) for r in results)
+        total_markup = sum(r.get('has_markup', 0) for r in results)
+        total_incomplete = sum(r.get('incomplete', 0) for r in results)
+        
+        print(f"\nOverall Statistics:")
+        print(f"  Scenarios Tested: {len(TEST_SCENARIOS)}")
+        print(f"  Successful Scenarios: {total_scenarios}")
+        print(f"  Total Questions Generated: {total_questions}")
+        print(f"  Fragment Rate: {total_fragments}/{total_questions} ({total_fragments/total_questions*100:.1f}%)" if total_questions > 0 else "  Fragment Rate: N/A")
+        print(f"  Markup Rate: {total_markup}/{total_questions} ({total_markup/total_questions*100:.1f}%)" if total_questions > 0 else "  Markup Rate: N/A")
+        print(f"  Incomplete Rate: {total_incomplete}/{total_questions} ({total_incomplete/total_questions*100:.1f}%)" if total_questions > 0 else "  Incomplete Rate: N/A")
+        
+        # Identify patterns
+        print(f"\n{'=' * 60}")
+        print("PATTERN ANALYSIS")
+        print("=" * 60)
         
-        worst_scenarios = sorted(valid_results, key=lambda x: x.get('fragments', 0) / x.get('total_questions', 1), reverse=True)[:3]
-        print(f"\nWorst Scenarios (highest fragment rate):")
-        for r in worst_scenarios:
-            frag_rate = r.get('fragments', 0) / r.get('total_questions', 1) * 100
-            print(f"  {r['scenario']}: {frag_rate:.1f}% fragments")
+        # Best scenarios (lowest fragment rate)
+        valid_results = [r for r in results if r.get('total_questions', 0) > 0]
+        if valid_results:
+            best_scenarios = sorted(valid_results, key=lambda x: x.get('fragments', 999) / x.get('total_questions', 1))[:3]
+            print(f"\nBest Scenarios (lowest fragment rate):")
+            for r in best_scenarios:
+                frag_rate = r.get('fragments', 0) / r.get('total_questions', 1) * 100
+                print(f"  {r['scenario']}: {frag_rate:.1f}% fragments")
+            
+            worst_scenarios = sorted(valid_results, key=lambda x: x.get('fragments', 0) / x.get('total_questions', 1), reverse=True)[:3]
+            print(f"\nWorst Scenarios (highest fragment rate):")
+            for r in worst_scenarios:
+                frag_rate = r.get('fragments', 0) / r.get('total_questions', 1) * 100
+                print(f"  {r['scenario']}: {frag_rate:.1f}% fragments")
+    sys.stdout.write(report.getvalue())
     
-    # Save detailed results
+    # Save detailed results, with the metrics as plain dicts
+    for r in results:
+        for q in r.get('questions', []):
+            q['_quality_metrics'] = q['_quality_metrics'].to_dict()
     output_file = '../data/question_quality_test_results.json'
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
+        f.write(json_dumps({
             'summary': {
                 'total_scenarios': len(TEST_SCENARIOS),
                 'successful_scenarios': total_scenarios,
@@ -264,7 +353,7 @@ def main():
                 'incomplete_rate': total_incomplete / total_questions if total_questions > 0 else 0
             },
             'scenarios': results
-        }, f, indent=2, ensure_ascii=False)
+        }, pretty=True))
     
     print(f"\n{'=' * 60}")
     print(f"Detailed results saved to: {output_file}")
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """Test the stub filter on example files."""
 import sys
-import json
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, 'src')
 from bulk_extract_characters import is_stub_character
+import _fastjson
+
+EXTRACT_DIR = 'data/characters/bulk_extract_full_20251114-083000'
 
 test_files = [
     'septimus.json',      # Bad - should be STUB
@@ -15,13 +18,20 @@ test_files = [
     'biddle_coleridge.json',  # Bad - should be STUB
 ]
 
-for f in test_files:
+def load_character(f):
+    """Load one extracted character file."""
+    with open(f'{EXTRACT_DIR}/{f}', 'rb') as file:
+        return _fastjson.load(file)
+
+# Read all files concurrently so their I/O overlaps, then report in list order
+with ThreadPoolExecutor(max_workers=8) as executor:
+    pending = [executor.submit(load_character, f) for f in test_files]
+
+for f, future in zip(test_files, pending):
     try:
-        with open(f'data/characters/bulk_extract_full_20251114-083000/{f}', encoding='utf-8') as file:
-            data = json.load(file)
+        data = future.result()
         is_stub = is_stub_character(data)
         status = "STUB (reject)" if is_stub else "KEEP"
         print(f"{f:30} -> {status}")
     except Exception as e:
         print(f"{f:30} -> ERROR: {e}")
-
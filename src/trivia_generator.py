@@ -3,18 +3,107 @@
 Main trivia question generator - ties together filtering, question generation, and difficulty scoring.
 """
 
-import json
+import os
+import re
 import sys
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Set, Tuple
 from filter_pages import filter_pages_by_tags, get_matching_pages
-from difficulty_scorer import calculate_difficulty, get_difficulty_level, filter_by_difficulty
+from difficulty_scorer import filter_by_difficulty
 from generate_questions import generate_questions_from_pages
 from episode_question_generator import is_episode_page, generate_episode_questions
+import _fastjson
+
+# Number of recent tag selections whose filter results are kept on the loaded data
+FILTER_CACHE_SIZE = 64
+
+# Parsed data files by path, with the mtime they were parsed at (see load_data)
+_loaded_data: Dict[str, Tuple[int, Dict]] = {}
 
 def load_data(data_path: str) -> Dict:
-    """Load extracted data from JSON file."""
-    with open(data_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """
+    Load extracted data from JSON file.
+    The parsed data is kept in memory and returned again, without parsing, for as long as
+    the file is unchanged. Worker processes forked after loading inherit it as well.
+    """
+    path = os.path.abspath(data_path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _loaded_data.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        data = _fastjson.load(f)
+    _loaded_data[path] = (mtime, data)
+    return data
+
+def _prefix_tree_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation matching any of words, factored into a prefix tree so
+    the engine only tries the words that share the text's prefix instead of each word
+    in turn. It matches exactly the same strings as a plain '|'.join of the words.
+    """
+    tree: Dict[str, Any] = {}
+    for word in words:
+        node = tree
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None  # A word ends here
+    
+    def build(node: Dict[str, Any]) -> str:
+        options = ['' if char == '' else re.escape(char) + build(child) for char, child in sorted(node.items())]
+        return options[0] if len(options) == 1 else '(?:' + '|'.join(options) + ')'
+    
+    return build(tree) if tree else '(?!)'
+
+def _classify_character_titles(
+    characters: List[str],
+    pages: List[Dict],
+    page_titles: List[str]
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Split pages into (exact, close, other) title matches for the selected characters.
+    page_titles holds each page's lowercased, stripped title.
+    """
+    # Find pages where title exactly matches character (or very close match)
+    character_titles: List[str] = [c.lower().strip() for c in characters]
+    # Also create variations (e.g., "Jean-Luc Picard" -> also check "Picard")
+    character_variations: Set[str] = set(character_titles)
+    for char_title in character_titles:
+        # Add last name if full name provided
+        parts = char_title.split()
+        if len(parts) > 1:
+            character_variations.add(parts[-1])  # Last name
+            if len(parts) > 2:
+                character_variations.add(' '.join(parts[-2:]))  # Last two words
+    
+    # Classify every title with one regex per match kind instead of looping over the
+    # variations: close is the name followed by ' ' or '(', reverse is a name longer
+    # than 3 characters at the start of the title or after a space
+    close_match_re: Pattern[str] = re.compile('(?:' + _prefix_tree_pattern(character_variations) + ')[ (]')
+    reverse_variations = [v for v in character_variations if len(v) > 3]  # Avoid short matches
+    reverse_match_re: Optional[Pattern[str]] = (
+        re.compile('(?:^| )(?:' + _prefix_tree_pattern(reverse_variations) + ')') if reverse_variations else None
+    )
+    
+    exact_match_pages: List[Dict] = []
+    close_match_pages: List[Dict] = []
+    other_pages: List[Dict] = []
+    
+    for page, page_title in zip(pages, page_titles):
+        # Exact match (title is exactly the character name)
+        if page_title in character_variations:
+            exact_match_pages.append(page)
+        # Close match (character name is the main part of title), or reverse match
+        # (e.g., "Picard" matches "Jean-Luc Picard")
+        elif close_match_re.match(page_title) or (reverse_match_re and reverse_match_re.search(page_title)):
+            close_match_pages.append(page)
+        else:
+            other_pages.append(page)
+    
+    return exact_match_pages, close_match_pages, other_pages
 
 def generate_trivia_questions(
     data: Dict,
@@ -51,19 +140,33 @@ def generate_trivia_questions(
     pages = data.get('pages', [])
     indices = data.get('indices', {})
     
-    # Step 1: Filter pages by tags
-    matching_indices = filter_pages_by_tags(
-        pages=pages,
-        indices=indices,
-        series=series,
-        characters=characters,
-        species=species,
-        locations=locations,
-        organizations=organizations,
-        concepts=concepts,
-        episodes=episodes,
-        match_all=False  # Match ANY selected tag
+    # Step 1: Filter pages by tags. Recent results are cached on the data, since repeated
+    # calls (e.g. test scenarios) often select the same tags. The filter returns sorted
+    # indices, so tag order within a list does not matter to the key
+    filter_cache = data.setdefault('_filter_cache', OrderedDict())
+    filter_key = tuple(
+        frozenset(tags) if tags else None
+        for tags in (series, characters, species, locations, organizations, concepts, episodes)
     )
+    matching_indices = filter_cache.get(filter_key)
+    if matching_indices is None:
+        matching_indices = filter_pages_by_tags(
+            pages=pages,
+            indices=indices,
+            series=series,
+            characters=characters,
+            species=species,
+            locations=locations,
+            organizations=organizations,
+            concepts=concepts,
+            episodes=episodes,
+            match_all=False  # Match ANY selected tag
+        )
+        filter_cache[filter_key] = matching_indices
+        if len(filter_cache) > FILTER_CACHE_SIZE:
+            filter_cache.popitem(last=False)
+    else:
+        filter_cache.move_to_end(filter_key)
     
     if not matching_indices:
         return []
@@ -74,47 +177,17 @@ def generate_trivia_questions(
     
     # Step 1.5: STRICT title matching for character searches (Priority 1 fix)
     if characters and len(characters) > 0:
-        # Find pages where title exactly matches character (or very close match)
-        character_titles = [c.lower().strip() for c in characters]
-        # Also create variations (e.g., "Jean-Luc Picard" -> also check "Picard")
-        character_variations = set(character_titles)
-        for char_title in character_titles:
-            # Add last name if full name provided
-            parts = char_title.split()
-            if len(parts) > 1:
-                character_variations.add(parts[-1])  # Last name
-                if len(parts) > 2:
-                    character_variations.add(' '.join(parts[-2:]))  # Last two words
-        
-        exact_match_pages = []
-        close_match_pages = []
-        other_pages = []
-        
+        # Normalized titles of the matching pages, stored on each page the first time it
+        # is matched so repeated calls on the same data do not normalize it again
+        page_titles = []
         for page in matching_pages:
-            page_title = page.get('title', '').lower().strip()
-            matched = False
-            
-            for char_title in character_variations:
-                # Exact match (title is exactly the character name)
-                if page_title == char_title:
-                    exact_match_pages.append(page)
-                    matched = True
-                    break
-                # Close match (character name is the main part of title)
-                elif page_title.startswith(char_title + ' ') or page_title.startswith(char_title + '('):
-                    close_match_pages.append(page)
-                    matched = True
-                    break
-                # Reverse match (title is part of character name, e.g., "Picard" matches "Jean-Luc Picard")
-                elif char_title in page_title and len(char_title) > 3:  # Avoid short matches
-                    # Check if it's a meaningful match (not just a substring)
-                    if page_title.startswith(char_title) or ' ' + char_title in page_title:
-                        close_match_pages.append(page)
-                        matched = True
-                        break
-            
-            if not matched:
-                other_pages.append(page)
+            title_lower = page.get('_title_lower')
+            if title_lower is None:
+                title_lower = page['_title_lower'] = page.get('title', '').lower().strip()
+            page_titles.append(title_lower)
+        exact_match_pages, close_match_pages, other_pages = _classify_character_titles(
+            characters, matching_pages, page_titles
+        )
         
         # Use strict matching: ONLY exact/close matches for character searches
         if exact_match_pages or close_match_pages:
@@ -134,56 +207,63 @@ def generate_trivia_questions(
     
     print(f"After difficulty filtering: {len(filtered_pages)} pages")
     
+    # Look up source pages by title; reversed so the first page with a title wins
+    title_to_page = {p.get('title'): p for p in reversed(filtered_pages)}
+    
     # Step 3: Generate questions
     # Prioritize episode pages for question generation (user's workflow)
-    episode_pages = [p for p in filtered_pages if is_episode_page(p)]
-    other_pages = [p for p in filtered_pages if not is_episode_page(p)]
-    
-    questions = []
-    
-    # Generate questions from episode pages first (preferred source)
-    for episode_page in episode_pages[:max_questions]:
-        episode_questions = generate_episode_questions(episode_page, max_questions=3)
-        questions.extend(episode_questions)
-        if len(questions) >= max_questions:
-            break
+    # Partition in a single pass. Episode classification never changes for a page, so
+    # it is stored on the page the first time and reused by later calls
+    episode_pages = []
+    other_pages = []
+    for p in filtered_pages:
+        is_episode = p.get('_is_episode')
+        if is_episode is None:
+            is_episode = p['_is_episode'] = is_episode_page(p)
+        (episode_pages if is_episode else other_pages).append(p)
     
-    # If we need more questions, generate from other pages
-    if len(questions) < max_questions:
+    def produce_questions():
+        """Yield questions from episode pages first (preferred source), then from other pages."""
+        produced = 0
+        for episode_page in episode_pages[:max_questions]:
+            for question in generate_episode_questions(episode_page, max_questions=3):
+                produced += 1
+                yield question
+        
+        # Only reached if the episode pages did not fill the quota
         focus_tags = {
             'characters': characters or [],
             'species': species or [],
             'locations': locations or []
         }
         
-        remaining_questions = generate_questions_from_pages(
+        yield from generate_questions_from_pages(
             other_pages,
             question_types=question_types,
             max_questions_per_page=3,
-            max_total_questions=max_questions - len(questions),
+            max_total_questions=max_questions - produced,
             focus_tags=focus_tags
         )
-        questions.extend(remaining_questions)
+    
+    # Stop pulling questions exactly at max_questions
+    questions = list(islice(produce_questions(), max_questions))
     
     # Step 4: Add difficulty scores to questions
     for question in questions:
         # Find source page
-        source_title = question.get('source_page')
-        source_page = next(
-            (p for p in filtered_pages if p.get('title') == source_title),
-            None
-        )
+        source_page = title_to_page.get(question.get('source_page'))
         
         if source_page:
-            difficulty = calculate_difficulty(source_page)
-            question['difficulty'] = difficulty
-            question['difficulty_level'] = get_difficulty_level(difficulty)
+            # filter_by_difficulty already scored every filtered page, so reuse its
+            # score rather than recomputing it for each question from the same page
+            question['difficulty'] = source_page['_difficulty']
+            question['difficulty_level'] = source_page['_difficulty_level']
         else:
             question['difficulty'] = 0.5
             question['difficulty_level'] = 'Medium'
     
-    # Sort by difficulty (easier first)
-    questions.sort(key=lambda q: q.get('difficulty', 0.5))
+    # Sort by difficulty (easier first); step 4 set it on every question
+    questions.sort(key=itemgetter('difficulty'))
     
     return questions
 
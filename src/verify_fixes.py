@@ -15,6 +15,9 @@ def verify_fixes():
     issues = []
     fixes_verified = []
     
+    # Read the extractor once for both of its checks
+    bulk_extract_content = bulk_extract_path.read_text(encoding='utf-8') if bulk_extract_path.exists() else None
+    
     # Check 1: Quote formatting fix in clean_mediawiki_markup
     print("\n1. Checking quote formatting fix...")
     if converter_path.exists():
@@ -48,13 +51,13 @@ def verify_fixes():
             issues.append("ERROR: Timeline event cleaning not found")
         
         # Count total uses of clean_mediawiki_markup
-        uses = len(re.findall(r'clean_mediawiki_markup\(', content))
+        uses = content.count('clean_mediawiki_markup(')
         fixes_verified.append(f"OK: clean_mediawiki_markup() called {uses} times (ensures comprehensive cleaning)")
     
     # Check 2: Stub filtering
     print("\n2. Checking stub filtering...")
-    if bulk_extract_path.exists():
-        content = bulk_extract_path.read_text(encoding='utf-8')
+    if bulk_extract_content is not None:
+        content = bulk_extract_content
         
         if 'def is_stub_character' in content:
             fixes_verified.append("OK: is_stub_character() function exists")
@@ -68,8 +71,8 @@ def verify_fixes():
     
     # Check 3: Direct converter integration
     print("\n3. Checking converter integration...")
-    if bulk_extract_path.exists():
-        content = bulk_extract_path.read_text(encoding='utf-8')
+    if bulk_extract_content is not None:
+        content = bulk_extract_content
         
         if 'from convert_character_direct import convert_from_json' in content:
             fixes_verified.append("OK: Direct converter is integrated")